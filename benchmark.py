@@ -1,10 +1,17 @@
+import argparse
 import json
+import re
 import sys
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
+from profiling import StageProfiler, stage
 from room_data import RoomData
-from room_matcher import RoomMatcher
+from room_matcher import DecisionCache, HedgingPolicy, RoomMatcher
+from run_store import IncrementalRunner, RunStore
+from sampling import SequentialEvaluator, StratifiedSampler
+from streaming_metrics import LiveEvaluator, MetricsAccumulator
+from variants import SolutionVariant, VariantRunner
 
 
 class Tee:
@@ -38,73 +45,72 @@ class Evaluator:
         """Evaluate matching solution performance"""
         metrics = self._calculate_metrics(results)
         self._print_evaluation(solution_name, metrics, len(results))
+        usage = self._calculate_usage_metrics(results)
+        if usage:
+            self._print_usage(usage)
 
     def _calculate_metrics(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate evaluation metrics"""
-        total_matched = 0
-        size_incorrect_matches = 0
-        total_size_error = 0
-        tp = fp = fn = tn = 0
-        low_confidence_count = 0
-        confidence_scores = []
-
+        accumulator = MetricsAccumulator(self)
         for item in results:
-            size_correct = item.get("size_correct", False)
-            solution_status = self._normalize_status(
-                item.get("solution_match_status", "")
-            )
-            confidence_score = item.get("confidence_score", 1.0)
-
-            confidence_scores.append(confidence_score)
-            if confidence_score < 0.7:
-                low_confidence_count += 1
-
-            if solution_status == "matched":
-                total_matched += 1
-                if size_correct:
-                    tp += 1
-                else:
-                    fp += 1
-                    size_incorrect_matches += 1
-                    # Calculate size error if available
-                    tvl_size = self._get_room_size(item, "tvl")
-                    comp_size = self._get_room_size(item, "competitor")
-                    if tvl_size and comp_size:
-                        total_size_error += abs(tvl_size - comp_size)
-            else:
-                if size_correct:
-                    fn += 1
-                else:
-                    tn += 1
-
-        avg_confidence = (
-            sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
-        )
-        precision = tp / (tp + fp) if (tp + fp) > 0 else 0
-        recall = tp / (tp + fn) if (tp + fn) > 0 else 0
-        f1_score = (
-            2 * (precision * recall) / (precision + recall)
-            if (precision + recall) > 0
-            else 0
+            accumulator.add(item)
+        return accumulator.metrics()
+
+    def _calculate_usage_metrics(
+        self, results: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Calculate latency, token and cost metrics of LLM calls, if any"""
+        # Results reused from a previous run cost nothing in this one
+        calls = [
+            item for item in results if "latency_s" in item and not item.get("reused")
+        ]
+        if not calls:
+            return None
+
+        latencies = sorted(item["latency_s"] for item in calls)
+        prompt_tokens = sum(item.get("prompt_tokens", 0) for item in calls)
+        cached_tokens = sum(item.get("cached_tokens", 0) for item in calls)
+        output_tokens = sum(item.get("output_tokens", 0) for item in calls)
+        total_cost = sum(item.get("cost_usd", 0.0) for item in calls)
+        escalated = sum(1 for item in results if item.get("escalated"))
+        hedged = sum(1 for item in calls if item.get("hedged"))
+        # Without hedging each pair would have waited for its primary call
+        unhedged = sorted(
+            item.get("unhedged_latency_s", item["latency_s"]) for item in calls
         )
 
         return {
-            "total_matched": total_matched,
-            "size_incorrect_matches": size_incorrect_matches,
-            "avg_size_error": total_size_error / size_incorrect_matches
-            if size_incorrect_matches > 0
-            else 0,
-            "precision": precision,
-            "recall": recall,
-            "f1_score": f1_score,
-            "tp": tp,
-            "fp": fp,
-            "tn": tn,
-            "fn": fn,
-            "avg_confidence": avg_confidence,
-            "low_confidence_count": low_confidence_count,
+            "calls": len(calls),
+            "is_cascade": any("escalated" in item for item in results),
+            "escalated": escalated,
+            "escalation_rate": escalated / len(results),
+            "total_latency_s": sum(latencies),
+            "avg_latency_s": sum(latencies) / len(latencies),
+            "p50_latency_s": self._percentile(latencies, 50),
+            "p95_latency_s": self._percentile(latencies, 95),
+            "p99_latency_s": self._percentile(latencies, 99),
+            "is_hedged": any("hedged" in item for item in calls),
+            "hedged": hedged,
+            "hedge_rate": hedged / len(calls),
+            "unhedged_p50_latency_s": self._percentile(unhedged, 50),
+            "unhedged_p95_latency_s": self._percentile(unhedged, 95),
+            "unhedged_p99_latency_s": self._percentile(unhedged, 99),
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "billed_input_tokens": prompt_tokens - cached_tokens,
+            "output_tokens": output_tokens,
+            "total_cost_usd": total_cost,
+            "cost_per_1k_pairs_usd": total_cost / len(results) * 1000,
         }
 
+    @staticmethod
+    def _percentile(sorted_values: List[float], pct: float) -> float:
+        """Nearest-rank percentile of an already sorted list"""
+        if not sorted_values:
+            return 0.0
+        rank = round(pct / 100 * len(sorted_values)) - 1
+        return sorted_values[max(0, min(len(sorted_values) - 1, rank))]
+
     def _normalize_status(self, status: str) -> str:
         """Normalize match status"""
         if status.startswith("MATCH_"):
@@ -159,12 +165,49 @@ class Evaluator:
         print(f"  False Negatives (FN): {metrics['fn']} (mismatched & size_correct)")
         print("=" * 50)
 
+    def _print_usage(self, usage: Dict[str, Any]):
+        """Print LLM latency, token and cost metrics"""
+        calls = usage["calls"]
+        print("LLM Usage:")
+        print(f"  LLM-judged pairs: {calls}")
+        if usage["is_cascade"]:
+            print(
+                f"  Escalated: {usage['escalated']} "
+                f"({usage['escalation_rate'] * 100:.1f}% of pairs)"
+            )
+        print(
+            f"  Latency avg/p50/p95/p99: {usage['avg_latency_s']:.3f}s / "
+            f"{usage['p50_latency_s']:.3f}s / {usage['p95_latency_s']:.3f}s / "
+            f"{usage['p99_latency_s']:.3f}s (total {usage['total_latency_s']:.1f}s)"
+        )
+        if usage["is_hedged"]:
+            print(
+                f"  Hedged: {usage['hedged']} ({usage['hedge_rate'] * 100:.1f}% of pairs)"
+            )
+            print(
+                f"  Latency without hedging p50/p95/p99: "
+                f"{usage['unhedged_p50_latency_s']:.3f}s / "
+                f"{usage['unhedged_p95_latency_s']:.3f}s / "
+                f"{usage['unhedged_p99_latency_s']:.3f}s"
+            )
+        print(
+            f"  Input tokens: {usage['prompt_tokens']} "
+            f"(cached {usage['cached_tokens']}, billed at full rate "
+            f"{usage['billed_input_tokens']}, {usage['prompt_tokens'] / calls:.0f}/pair)"
+        )
+        print(f"  Output tokens: {usage['output_tokens']}")
+        print(
+            f"  Estimated cost: ${usage['total_cost_usd']:.4f} "
+            f"(${usage['cost_per_1k_pairs_usd']:.4f} per 1,000 pairs)"
+        )
+        print("=" * 50)
+
     def compare_solutions(
         self,
         input_data: List[Dict[str, Any]],
         solutions: Dict[str, List[Dict[str, Any]]],
     ):
-        """Compare different solutions"""
+        """Compare different solutions case by case"""
         if not self.show_diff_cases:
             return
 
@@ -176,23 +219,22 @@ class Evaluator:
             "TVL Size",
             "COMP Room",
             "COMP Size",
-            "Original",
-            "LLM",
+            *solutions,
             "Size OK",
-            "LLM Conf",
             "Equal?",
         ]
 
-        col_widths = [36, 8, 40, 8, 40, 8, 10, 10, 8, 8, 8]
-        header_line = " | ".join(f"{h:<{w}}" for h, w in zip(header, col_widths))
+        # Solution columns show "<status> <confidence>"
+        solution_widths = [max(16, min(len(name), 30)) for name in solutions]
+        col_widths = [36, 8, 40, 8, 40, 8, *solution_widths, 8, 8]
+        header_line = " | ".join(
+            f"{h[:w]:<{w}}" for h, w in zip(header, col_widths)
+        )
         print(header_line)
         print("-" * len(header_line))
 
-        original_solution = solutions.get("Original Solution", [])
-        llm_solution = solutions.get("LLM Solution", [])
-
-        for i, (item, orig_item, llm_item) in enumerate(
-            zip(input_data, original_solution, llm_solution)
+        for i, (item, *solution_items) in enumerate(
+            zip(input_data, *solutions.values())
         ):
             uuid_str = item.get("uuid_str", "")[:35]
             case_id = str(item.get("tvl_id", f"case_{i}"))[:7]
@@ -200,14 +242,11 @@ class Evaluator:
             tvl_room = RoomData.from_dict(item, "tvl")
             comp_room = RoomData.from_dict(item, "competitor")
 
-            original_status = self._normalize_status(
-                orig_item.get("solution_match_status", "")
-            )
-            llm_status = self._normalize_status(
-                llm_item.get("solution_match_status", "")
-            )
-            size_correct = llm_item.get("size_correct", False)
-            confidence = llm_item.get("confidence_score", 0.0)
+            statuses = [
+                self._normalize_status(solution_item.get("solution_match_status", ""))
+                for solution_item in solution_items
+            ]
+            size_correct = solution_items[-1].get("size_correct", False)
 
             values = [
                 uuid_str,
@@ -216,11 +255,12 @@ class Evaluator:
                 str(tvl_room.size or "")[:7],
                 comp_room.name[:39],
                 str(comp_room.size or "")[:7],
-                original_status[:9],
-                llm_status[:9],
+                *(
+                    f"{status[:10]} {solution_item.get('confidence_score', 0.0):.2f}"
+                    for status, solution_item in zip(statuses, solution_items)
+                ),
                 "✓" if size_correct else "✗",
-                f"{confidence:.2f}",
-                "=" if original_status == llm_status else "DIFF",
+                "=" if len(set(statuses)) <= 1 else "DIFF",
             ]
 
             line = " | ".join(f"{str(v):<{w}}" for v, w in zip(values, col_widths))
@@ -228,6 +268,130 @@ class Evaluator:
 
         print("=" * 50)
 
+    def print_metrics_matrix(self, solutions: Dict[str, List[Dict[str, Any]]]):
+        """Print one row of metrics per solution and their pairwise agreement"""
+        rows = []
+        for name, results in solutions.items():
+            metrics = self._calculate_metrics(results)
+            usage = self._calculate_usage_metrics(results) or {}
+            rows.append((name, len(results), metrics, usage))
+
+        name_width = max([len("Solution")] + [len(name) for name in solutions])
+        print("\n=== Metrics Matrix ===")
+        header = (
+            f"{'Solution':<{name_width}} {'N':>5} {'Precision':>9} {'Recall':>7} "
+            f"{'F1':>7} {'TP/FP/TN/FN':>17} {'Conf':>5} {'p50 s':>7} {'p95 s':>7} "
+            f"{'$/1k':>8}"
+        )
+        print(header)
+        print("-" * len(header))
+        for name, count, metrics, usage in rows:
+            confusion = f"{metrics['tp']}/{metrics['fp']}/{metrics['tn']}/{metrics['fn']}"
+            latency = (
+                f"{usage['p50_latency_s']:>7.3f} {usage['p95_latency_s']:>7.3f}"
+                if usage
+                else f"{'-':>7} {'-':>7}"
+            )
+            cost = f"{usage['cost_per_1k_pairs_usd']:>8.4f}" if usage else f"{'-':>8}"
+            print(
+                f"{name:<{name_width}} {count:>5} {metrics['precision']:>9.4f} "
+                f"{metrics['recall']:>7.4f} {metrics['f1_score']:>7.4f} "
+                f"{confusion:>17} {metrics['avg_confidence']:>5.2f} {latency} {cost}"
+            )
+
+        # Share of cases where two solutions reach the same decision
+        names = list(solutions)
+        statuses = {
+            name: [
+                self._normalize_status(item.get("solution_match_status", ""))
+                for item in results
+            ]
+            for name, results in solutions.items()
+        }
+        print("\nDecision agreement:")
+        print(
+            f"  {'':<{name_width + 4}} "
+            + " ".join(f"{f'[{k}]':>7}" for k in range(len(names)))
+        )
+        for k, name in enumerate(names):
+            cells = []
+            for other in names:
+                pairs = list(zip(statuses[name], statuses[other]))
+                agreement = (
+                    sum(1 for a, b in pairs if a == b) / len(pairs) if pairs else 0.0
+                )
+                cells.append(f"{agreement * 100:>6.1f}%")
+            print(f"  [{k}] {name:<{name_width}} {' '.join(cells)}")
+        print("=" * 50)
+
+    def print_hotel_matching_summary(self, hotel_results: Dict[str, Dict[str, Any]]):
+        """Print candidate pruning and assignments of hotel-level matching"""
+        print("\n=== Hotel-Level Matching Summary ===")
+        header = [
+            "Hotel ID",
+            "TVL",
+            "COMP",
+            "N×M",
+            "Unique",
+            "Cand.",
+            "Judged",
+            "Dedup",
+            "Pruned",
+            "Matched",
+        ]
+        col_widths = [16, 5, 5, 7, 7, 7, 7, 8, 8, 8]
+        header_line = " | ".join(f"{h:<{w}}" for h, w in zip(header, col_widths))
+        print(header_line)
+        print("-" * len(header_line))
+
+        totals = {
+            "total_pairs": 0,
+            "unique_pairs": 0,
+            "candidate_pairs": 0,
+            "pairs_judged": 0,
+        }
+        for hotel_id, result in hotel_results.items():
+            stats = result["stats"]
+            matched = sum(1 for m in result["matches"] if m["competitor_room"])
+            for key in totals:
+                totals[key] += stats[key]
+            values = [
+                hotel_id[:15],
+                stats["tvl_rooms"],
+                stats["competitor_rooms"],
+                stats["total_pairs"],
+                stats["unique_pairs"],
+                stats["candidate_pairs"],
+                stats["pairs_judged"],
+                f"{stats['dedup_ratio'] * 100:.1f}%",
+                f"{stats['pruning_ratio'] * 100:.1f}%",
+                f"{matched}/{stats['tvl_rooms']}",
+            ]
+            print(" | ".join(f"{str(v):<{w}}" for v, w in zip(values, col_widths)))
+
+        hotels = len(hotel_results)
+        dedup_ratio = (
+            1 - totals["unique_pairs"] / totals["total_pairs"]
+            if totals["total_pairs"]
+            else 0
+        )
+        pruning_ratio = (
+            1 - totals["candidate_pairs"] / totals["unique_pairs"]
+            if totals["unique_pairs"]
+            else 0
+        )
+        print(f"\nHotels: {hotels}")
+        print(
+            f"Pairs: {totals['total_pairs']} total, {totals['unique_pairs']} after "
+            f"merging rate plans, {totals['candidate_pairs']} after blocking, "
+            f"{totals['pairs_judged']} judged"
+        )
+        print(f"Rate-plan dedup ratio: {dedup_ratio * 100:.1f}%")
+        print(f"Blocking pruning ratio: {pruning_ratio * 100:.1f}%")
+        if hotels:
+            print(f"Pairs judged per hotel: {totals['pairs_judged'] / hotels:.2f}")
+        print("====================================")
+
     def print_size_summary(self, data: List[Dict[str, Any]]):
         """Print room size distribution summary"""
         tvl_sizes, comp_sizes = [], []
@@ -259,19 +423,87 @@ class Evaluator:
         print("====================================")
 
 
+# Projection of the room fields read by RoomData.from_dict and filter_valid_data
+ROOM_FIELDS: Dict[str, Any] = {"hard_metrics": True, "soft_metrics": True}
+
+# Projection of the record fields read by the solutions, the Evaluator and
+# the StratifiedSampler (STRATA_FIELDS).
+# `True` keeps a whole subtree, a nested dict keeps only the listed keys.
+BENCHMARK_FIELDS: Dict[str, Any] = {
+    "tvl_id": True,
+    "hotel_id": True,
+    "hotel_name": True,
+    "match_status": True,
+    "status_tag": True,
+    "tvl": {**ROOM_FIELDS, "others": {"room_size_bin": True}},
+    "competitor": {**ROOM_FIELDS, "others": {"competitor_id": True}},
+}
+
+_WHITESPACE = re.compile(r"\s*")
+
+
 class DataProcessor:
     """Data loading and preprocessing"""
 
     @staticmethod
-    def load_data(file_path: str) -> List[Dict[str, Any]]:
-        """Load data from JSON file"""
+    def load_data(
+        file_path: str, fields: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Load data from JSON file
+
+        When `fields` is given, each record of the top-level array is projected
+        as soon as it is decoded, so unused subtrees are never retained.
+        """
         try:
             with open(file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+                if fields is None:
+                    return json.load(f)
+                text = f.read()
+            return [
+                DataProcessor.project_fields(record, fields)
+                for record in DataProcessor._iter_json_array(text)
+            ]
         except Exception as e:
             print(f"⚠️ Error loading {file_path}: {e}", file=sys.stderr)
             return []
 
+    @staticmethod
+    def _iter_json_array(text: str) -> Iterator[Any]:
+        """Decode the elements of a top-level JSON array one at a time"""
+        decoder = json.JSONDecoder()
+        idx = _WHITESPACE.match(text, 0).end()
+        if text[idx : idx + 1] != "[":
+            raise ValueError("Expected a top-level JSON array")
+        idx = _WHITESPACE.match(text, idx + 1).end()
+        if text[idx : idx + 1] == "]":
+            return
+
+        while True:
+            record, idx = decoder.raw_decode(text, idx)
+            yield record
+            idx = _WHITESPACE.match(text, idx).end()
+            separator = text[idx : idx + 1]
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' at position {idx}")
+            idx = _WHITESPACE.match(text, idx + 1).end()
+
+    @staticmethod
+    def project_fields(value: Any, fields: Any) -> Any:
+        """Keep only the declared fields of a decoded JSON value"""
+        if fields is True:
+            return value
+        if isinstance(value, list):
+            return [DataProcessor.project_fields(v, fields) for v in value]
+        if not isinstance(value, dict):
+            return value
+        return {
+            key: DataProcessor.project_fields(value[key], sub_fields)
+            for key, sub_fields in fields.items()
+            if key in value
+        }
+
     @staticmethod
     def filter_valid_data(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter data to include only valid entries"""
@@ -310,6 +542,22 @@ class DataProcessor:
         )
         return deduped
 
+    @staticmethod
+    def group_by_hotel(
+        data: List[Dict[str, Any]],
+    ) -> Dict[str, Dict[str, List[RoomData]]]:
+        """Collect the distinct TVL and competitor rooms of each hotel"""
+        hotels: Dict[str, Dict[str, List[RoomData]]] = {}
+        for item in data:
+            hotel = hotels.setdefault(
+                str(item.get("hotel_id", "")), {"tvl": [], "competitor": []}
+            )
+            for source in ("tvl", "competitor"):
+                room = RoomData.from_dict(item, source)
+                if room not in hotel[source]:
+                    hotel[source].append(room)
+        return hotels
+
     @staticmethod
     def add_uuids(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Add UUID to each data entry"""
@@ -318,17 +566,58 @@ class DataProcessor:
         return data
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """Main execution function"""
+    parser = argparse.ArgumentParser(description="Hotel room matching benchmark")
+    parser.add_argument(
+        "--profile", action="store_true", help="Time each pipeline stage"
+    )
+    parser.add_argument(
+        "--cprofile", action="store_true", help="Also run cProfile (implies --profile)"
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Also trace memory per stage with tracemalloc (implies --profile)",
+    )
+    args = parser.parse_args(argv)
+
     # Configuration
     start = 0
     cnt = 300
+    prompt_mode = "full"  # "full", "system_instruction" or "cached"
+    cascade_threshold = None  # e.g. 0.8 to also run the model cascade
+    max_hedge_rate = None  # e.g. 0.1 to hedge LLM calls slower than the p95
+    run_hotel_matching = False  # match all rooms per hotel with blocking
+    sample_mode = "slice"  # "slice", "stratified" or "sequential"
+    ci_half_width = 0.05  # sequential: stop when P/R 95% CIs are this narrow
+    # sequential: most items to pay for; None streams the whole dataset so
+    # the CI target, not the slice size, ends the run
+    sequential_max_items = None
+    seed = 0
+    incremental = False  # reuse results of unchanged items from the last run
+    progress_every = 25  # live metrics line every N LLM results
+    max_error_rate = None  # e.g. 0.2 to abort the LLM run above 20% errors
+    max_throttle_rate = None  # e.g. 0.1 to abort above 10% throttled calls
+    # Extra variants run concurrently on the subset, e.g.
+    # SolutionVariant("flash-lite", model="gemini-2.5-flash-lite"),
+    # SolutionVariant("flash-think", thinking_budget=1024, prompt_mode="cached")
+    variants: List[SolutionVariant] = []
+    variant_concurrency = 16  # shared scheduler workers across all variants
     input_file_name = "xrm_sample_1600_datapoints_v2"
     output_filename = f"./output/{input_file_name}_output_{start}-{cnt}.txt"
+    run_store_path = f"./output/{input_file_name}_runs.json"
 
     # Initialize components
     tee = Tee(output_filename, "w")
-    matcher = RoomMatcher()  # Enable detailed logging
+    profiler = None
+    if args.profile or args.cprofile or args.trace_memory:
+        profiler = StageProfiler(trace_memory=args.trace_memory, cprofile=args.cprofile)
+        profiler.start()
+    matcher = RoomMatcher(
+        prompt_mode=prompt_mode,
+        hedging=HedgingPolicy(max_hedge_rate) if max_hedge_rate else None,
+    )
     evaluator = Evaluator(show_diff_cases=True)
     processor = DataProcessor()
 
@@ -336,41 +625,160 @@ def main():
 
     # Load and preprocess data
     file_path = f"./data/{input_file_name}.json"
-    raw_data = processor.load_data(file_path)
+    with stage("load_data"):
+        raw_data = processor.load_data(file_path, fields=BENCHMARK_FIELDS)
 
     if not raw_data:
         print("No data loaded. Exiting.")
         return
 
     # Process data pipeline
-    valid_data = processor.filter_valid_data(raw_data)
-    deduped_data = processor.deduplicate_data(valid_data)
-    full_dataset = processor.add_uuids(deduped_data)
+    with stage("filter_valid_data"):
+        valid_data = processor.filter_valid_data(raw_data)
+    with stage("deduplicate_data"):
+        deduped_data = processor.deduplicate_data(valid_data)
+    with stage("add_uuids"):
+        full_dataset = processor.add_uuids(deduped_data)
 
     # Evaluate on full dataset first (for original solution)
-    original_results_full = matcher.original_solution(full_dataset)
-    evaluator.evaluate_solution(
-        "Original Solution (Full Dataset)", original_results_full
-    )
+    with stage("original_solution (full)"):
+        original_results_full = matcher.original_solution(full_dataset)
+    with stage("evaluate"):
+        evaluator.evaluate_solution(
+            "Original Solution (Full Dataset)", original_results_full
+        )
+
+    # The local scorer's n-gram IDF is fixed on the full dataset, so subset
+    # and full-dataset local scores agree
+    with stage("fit_local_scorer"):
+        matcher.fit_local_scorer(full_dataset)
+    with stage("local_solution (full)"):
+        local_results_full = matcher.local_solution(full_dataset)
+    with stage("evaluate"):
+        evaluator.evaluate_solution("Local Solution (Full Dataset)", local_results_full)
 
     # Work with subset
-    subset_data = full_dataset[start : start + cnt]
+    llm_results = None
+    sampler = StratifiedSampler(seed=seed)
+    with stage("sampling"):
+        if sample_mode == "stratified":
+            subset_data = sampler.sample(full_dataset, cnt)
+        elif sample_mode == "sequential":
+            # Stop paying for LLM calls once the metrics are precise enough
+            sequential = SequentialEvaluator(
+                evaluator,
+                target_half_width=ci_half_width,
+                max_items=sequential_max_items,
+            )
+            subset_data, llm_results = sequential.run(
+                matcher.llm_solution, sampler.stream(full_dataset)
+            )
+        else:
+            subset_data = full_dataset[start : start + cnt]
     evaluator.print_size_summary(subset_data)
 
     # Run matching solutions
     print(f"\nProcessing subset: {len(subset_data)} entries")
-    original_results = matcher.original_solution(subset_data)
-    llm_results = matcher.llm_solution(subset_data)
+    if incremental:
+        runner = IncrementalRunner(RunStore(run_store_path))
+        with stage("original_solution"):
+            original_results = runner.run(
+                "original",
+                matcher.original_solution,
+                subset_data,
+                matcher.solution_fingerprint("original"),
+            )
+        with stage("local_solution"):
+            local_results = runner.run(
+                "local",
+                matcher.local_solution,
+                subset_data,
+                matcher.solution_fingerprint("local"),
+            )
+        if llm_results is None:
+            with stage("llm_solution"):
+                llm_results = runner.run(
+                    "llm",
+                    matcher.llm_solution,
+                    subset_data,
+                    matcher.solution_fingerprint("llm"),
+                )
+    else:
+        with stage("original_solution"):
+            original_results = matcher.original_solution(subset_data)
+        with stage("local_solution"):
+            local_results = matcher.local_solution(subset_data)
+        if llm_results is None:
+            live = LiveEvaluator(
+                evaluator,
+                progress_every=progress_every,
+                max_error_rate=max_error_rate,
+                max_throttle_rate=max_throttle_rate,
+            )
+            with stage("llm_solution"):
+                llm_results, abort_reason = live.run(
+                    matcher.iter_llm_solution(subset_data), total=len(subset_data)
+                )
+            if abort_reason:
+                # Compare all solutions on the pairs the LLM actually judged
+                subset_data = subset_data[: len(llm_results)]
+                original_results = original_results[: len(llm_results)]
+                local_results = local_results[: len(llm_results)]
 
     # Evaluate solutions
-    evaluator.evaluate_solution("Original Solution", original_results)
-    evaluator.evaluate_solution("LLM Solution", llm_results)
+    with stage("evaluate"):
+        evaluator.evaluate_solution("Original Solution", original_results)
+        evaluator.evaluate_solution("Local Solution", local_results)
+        evaluator.evaluate_solution(
+            f"LLM Solution ({prompt_mode} prompt)", llm_results
+        )
+    if cascade_threshold is not None:
+        with stage("cascade_solution"):
+            cascade_results = matcher.cascade_solution(
+                subset_data, confidence_threshold=cascade_threshold
+            )
+        with stage("evaluate"):
+            evaluator.evaluate_solution(
+                f"Cascade Solution (threshold {cascade_threshold})", cascade_results
+            )
+
+    if run_hotel_matching:
+        with stage("hotel_matching"):
+            hotel_results = {
+                hotel_id: matcher.match_hotel(rooms["tvl"], rooms["competitor"])
+                for hotel_id, rooms in processor.group_by_hotel(subset_data).items()
+            }
+        evaluator.print_hotel_matching_summary(hotel_results)
+
+    solutions = {
+        "Original Solution": original_results,
+        "Local Solution": local_results,
+        "LLM Solution": llm_results,
+    }
+    if variants:
+        runner = VariantRunner(
+            variants,
+            max_concurrency=variant_concurrency,
+            client=matcher._get_client(),
+            decision_cache=DecisionCache(),
+            local_scorer=matcher.local_scorer,
+        )
+        with stage("variants"):
+            variant_results = runner.run(subset_data)
+        with stage("evaluate"):
+            for name, results in variant_results.items():
+                evaluator.evaluate_solution(f"Variant {name}", results)
+        solutions.update(variant_results)
 
     # Compare solutions
-    evaluator.compare_solutions(
-        subset_data,
-        {"Original Solution": original_results, "LLM Solution": llm_results},
-    )
+    with stage("compare_solutions"):
+        evaluator.print_metrics_matrix(solutions)
+        evaluator.compare_solutions(subset_data, solutions)
+
+    if profiler is not None:
+        profiler.stop()
+        profiler.print_report()
+        profiler.write(output_filename[: -len(".txt")])
 
     # Cleanup
     del tee
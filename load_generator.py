@@ -0,0 +1,155 @@
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from benchmark import BENCHMARK_FIELDS, DataProcessor, Evaluator
+
+DEFAULT_DATASETS = ["./data/xrm_sample_1600_datapoints_v2.json"]
+
+
+def load_items(file_paths: List[str]) -> List[Dict[str, Any]]:
+    """Load and filter the datasets to replay"""
+    items: List[Dict[str, Any]] = []
+    for file_path in file_paths:
+        data = DataProcessor.load_data(file_path, fields=BENCHMARK_FIELDS)
+        items.extend(DataProcessor.filter_valid_data(data))
+    return items
+
+
+def post_json(url: str, payload: Dict[str, Any], timeout_s: float) -> Dict[str, Any]:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=timeout_s) as response:
+        return json.loads(response.read())
+
+
+def replay(
+    base_url: str,
+    items: List[Dict[str, Any]],
+    requests: int,
+    concurrency: int,
+    items_per_request: int,
+    timeout_s: float,
+) -> Dict[str, Any]:
+    """Send `requests` POST /match calls from `concurrency` threads"""
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def send(index: int):
+        nonlocal errors
+        start = index * items_per_request
+        batch = [items[(start + k) % len(items)] for k in range(items_per_request)]
+        request_start = time.perf_counter()
+        try:
+            results = post_json(f"{base_url}/match", {"items": batch}, timeout_s)
+            failed = sum(1 for result in results["results"] if "error" in result)
+        except Exception:
+            failed = len(batch)
+        latency = time.perf_counter() - request_start
+        with lock:
+            latencies.append(latency)
+            errors += failed
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, range(requests)))
+    wall_s = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "pairs": requests * items_per_request,
+        "errors": errors,
+        "wall_s": wall_s,
+        "requests_per_s": requests / wall_s,
+        "pairs_per_s": requests * items_per_request / wall_s,
+        "p50_latency_s": Evaluator._percentile(latencies, 50),
+        "p95_latency_s": Evaluator._percentile(latencies, 95),
+        "p99_latency_s": Evaluator._percentile(latencies, 99),
+        "max_latency_s": latencies[-1] if latencies else 0.0,
+    }
+
+
+def print_report(report: Dict[str, Any], server_stats: Optional[Dict[str, Any]]):
+    print("\n=== Load Generator Report ===")
+    print(f"Requests: {report['requests']} ({report['pairs']} pairs, {report['errors']} errors)")
+    print(f"Wall time: {report['wall_s']:.2f}s")
+    print(
+        f"Throughput: {report['requests_per_s']:.1f} req/s, "
+        f"{report['pairs_per_s']:.1f} pairs/s"
+    )
+    print(
+        f"Latency p50/p95/p99/max: {report['p50_latency_s'] * 1000:.1f} / "
+        f"{report['p95_latency_s'] * 1000:.1f} / {report['p99_latency_s'] * 1000:.1f} / "
+        f"{report['max_latency_s'] * 1000:.1f} ms"
+    )
+    if server_stats:
+        print(
+            f"Server: {server_stats['batches']} batches, avg size "
+            f"{server_stats['avg_batch_size']:.1f}, {server_stats['unique_pairs']} "
+            f"distinct pairs judged, cache hits {server_stats['cache_hits']} / "
+            f"misses {server_stats['cache_misses']}"
+        )
+    print("=============================")
+
+
+def main():
+    """Replay the bundled datasets against the matching service"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--url", help="Service URL; default starts a mock service")
+    parser.add_argument("--data", nargs="+", default=DEFAULT_DATASETS)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--items-per-request", type=int, default=1)
+    parser.add_argument("--timeout-s", type=float, default=60.0)
+    parser.add_argument("--mock-latency-ms", type=float, default=300.0)
+    parser.add_argument("--window-ms", type=float, default=10.0)
+    parser.add_argument("--max-batch", type=int, default=32)
+    args = parser.parse_args()
+
+    items = load_items(args.data)
+    if not items:
+        print("No data loaded. Exiting.")
+        return
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        from matching_service import build_matcher, create_server
+
+        server, _ = create_server(
+            build_matcher(mock=True, mock_latency_ms=args.mock_latency_ms),
+            port=0,
+            window_ms=args.window_ms,
+            max_batch=args.max_batch,
+            workers=args.concurrency,
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+    report = replay(
+        base_url,
+        items,
+        args.requests,
+        args.concurrency,
+        args.items_per_request,
+        args.timeout_s,
+    )
+    with urllib.request.urlopen(f"{base_url}/stats", timeout=args.timeout_s) as r:
+        server_stats = json.loads(r.read())
+    print_report(report, server_stats)
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
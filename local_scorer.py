@@ -0,0 +1,203 @@
+import hashlib
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from room_blocking import bed_categories, normalize_tokens, room_tier, size_spd
+from room_data import RoomData
+
+# Weights of the logistic score; hand-tuned on xrm_sample_1600_datapoints_v2
+FEATURE_WEIGHTS: Dict[str, float] = {
+    "bias": -2.5,
+    "name_similarity": 3.0,
+    "tier_compatible": 0.8,
+    "bed_compatible": 0.6,
+    "occupancy_compatible": 0.6,
+    "size_similarity": 1.8,
+}
+
+
+@lru_cache(maxsize=4096)
+def _bed_compatibility(tvl_bed: Optional[str], comp_bed: Optional[str]) -> float:
+    """1.0 compatible, 0.5 unknown or judged by occupancy, 0.0 incompatible"""
+    tvl_beds, comp_beds = bed_categories(tvl_bed), bed_categories(comp_bed)
+    if not tvl_beds or not comp_beds:
+        return 0.5
+    if tvl_beds & comp_beds:
+        return 1.0
+    if "single" in tvl_beds or "single" in comp_beds:
+        return 0.0
+    return 0.5
+
+
+class LocalSimilarityScorer:
+    """Vectorized local room pair scorer
+
+    Room names are normalized (marketing and view words removed) and
+    compared with character n-gram TF-IDF cosine similarity, computed for
+    all pairs at once with sparse COO arrays. The similarity is combined
+    with tier, bed type, occupancy and size features in a logistic score.
+
+    The n-gram vocabulary and IDF are fitted once on a fixed corpus of room
+    names (fit()), so a pair scores the same whatever else is in the batch.
+    N-grams unseen in the corpus get the IDF of a document frequency of 0.
+    """
+
+    def __init__(
+        self,
+        ngram_range: Tuple[int, int] = (2, 4),
+        weights: Optional[Dict[str, float]] = None,
+        threshold: float = 0.5,
+    ):
+        self.ngram_range = ngram_range
+        self.weights = weights or FEATURE_WEIGHTS
+        self.threshold = threshold
+        self.vocabulary: Dict[str, int] = {}
+        self.idf: Optional[np.ndarray] = None
+        self.unseen_idf = 1.0
+        self.corpus_hash: Optional[str] = None
+
+    @staticmethod
+    def _normalized_text(name: Optional[str]) -> str:
+        return f" {' '.join(sorted(normalize_tokens(name)))} "
+
+    def _ngrams(self, text: str) -> Iterator[str]:
+        low, high = self.ngram_range
+        for n in range(low, high + 1):
+            for start in range(len(text) - n + 1):
+                yield text[start : start + n]
+
+    def fit(self, names: Iterable[Optional[str]]) -> "LocalSimilarityScorer":
+        """Fix the n-gram vocabulary and smoothed IDF on a corpus of names
+
+        Each distinct normalized name counts as one document, so rate-plan
+        duplicates do not skew the IDF.
+        """
+        texts = sorted({self._normalized_text(name) for name in names})
+        doc_freq: Dict[str, int] = {}
+        for text in texts:
+            for ngram in set(self._ngrams(text)):
+                doc_freq[ngram] = doc_freq.get(ngram, 0) + 1
+
+        self.vocabulary = {ngram: i for i, ngram in enumerate(sorted(doc_freq))}
+        frequencies = np.asarray(
+            [doc_freq[ngram] for ngram in self.vocabulary], dtype=np.float64
+        )
+        # Smoothed idf, as in scikit-learn's TfidfVectorizer
+        self.idf = np.log((1 + len(texts)) / (1 + frequencies)) + 1
+        self.unseen_idf = float(np.log(1 + len(texts)) + 1)
+        corpus = "\n".join([repr(self.ngram_range)] + texts)
+        self.corpus_hash = hashlib.sha256(corpus.encode("utf-8")).hexdigest()[:16]
+        return self
+
+    def _ngram_matrix(self, names: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """L2-normalized TF-IDF rows as COO arrays (rows, cols, values)"""
+        if self.idf is None:
+            raise ValueError("LocalSimilarityScorer.fit() must be called first")
+        # N-grams outside the fitted vocabulary get columns after it
+        unseen: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, name in enumerate(names):
+            for ngram in self._ngrams(self._normalized_text(name)):
+                col = self.vocabulary.get(ngram)
+                if col is None:
+                    col = unseen.setdefault(ngram, len(self.vocabulary) + len(unseen))
+                rows.append(row)
+                cols.append(col)
+
+        vocab_size = max(len(self.vocabulary) + len(unseen), 1)
+        keys, counts = np.unique(
+            np.asarray(rows, dtype=np.int64) * vocab_size + np.asarray(cols, dtype=np.int64),
+            return_counts=True,
+        )
+        rows_arr, cols_arr = keys // vocab_size, keys % vocab_size
+
+        # Sublinear tf times the corpus idf
+        idf = np.concatenate([self.idf, np.full(len(unseen), self.unseen_idf)])
+        values = (1 + np.log(counts)) * idf[cols_arr]
+
+        norms = np.sqrt(np.bincount(rows_arr, weights=values**2, minlength=len(names)))
+        values = values / norms[rows_arr]
+        return rows_arr, cols_arr, values
+
+    def name_similarity(
+        self, tvl_names: List[str], comp_names: List[str]
+    ) -> np.ndarray:
+        """Cosine similarity of aligned TVL/competitor name pairs"""
+        n_pairs = len(tvl_names)
+        rows, cols, values = self._ngram_matrix(list(tvl_names) + list(comp_names))
+        vocab_size = int(cols.max()) + 1 if len(cols) else 1
+
+        # Both halves are keyed by (pair index, n-gram) so the per-pair dot
+        # product is a join on equal keys
+        is_tvl = rows < n_pairs
+        tvl_keys = rows[is_tvl] * vocab_size + cols[is_tvl]
+        comp_keys = (rows[~is_tvl] - n_pairs) * vocab_size + cols[~is_tvl]
+        common, tvl_idx, comp_idx = np.intersect1d(
+            tvl_keys, comp_keys, assume_unique=True, return_indices=True
+        )
+        products = values[is_tvl][tvl_idx] * values[~is_tvl][comp_idx]
+        return np.bincount(common // vocab_size, weights=products, minlength=n_pairs)
+
+    def features(
+        self, tvl_rooms: List[RoomData], comp_rooms: List[RoomData]
+    ) -> Dict[str, np.ndarray]:
+        """Feature columns for aligned room pairs"""
+        tier_compatible, bed_compatible, occupancy_compatible, size_similarity = (
+            [],
+            [],
+            [],
+            [],
+        )
+        for tvl_room, comp_room in zip(tvl_rooms, comp_rooms):
+            tvl_tier = room_tier(normalize_tokens(tvl_room.name))
+            comp_tier = room_tier(normalize_tokens(comp_room.name))
+            if tvl_tier is None or comp_tier is None:
+                tier_compatible.append(0.5)
+            else:
+                tier_compatible.append(1.0 if abs(tvl_tier - comp_tier) <= 1 else 0.0)
+
+            bed_compatible.append(_bed_compatibility(tvl_room.bed_type, comp_room.bed_type))
+
+            if not tvl_room.occupancy or not comp_room.occupancy:
+                occupancy_compatible.append(0.5)
+            else:
+                gap = abs(tvl_room.occupancy - comp_room.occupancy)
+                occupancy_compatible.append(1.0 if gap <= 2 else 0.0)
+
+            spd = size_spd(tvl_room.size, comp_room.size)
+            size_similarity.append(0.5 if spd is None else max(0.0, 1.0 - spd / 0.4))
+
+        return {
+            "name_similarity": self.name_similarity(
+                [room.name or "" for room in tvl_rooms],
+                [room.name or "" for room in comp_rooms],
+            ),
+            "tier_compatible": np.asarray(tier_compatible),
+            "bed_compatible": np.asarray(bed_compatible),
+            "occupancy_compatible": np.asarray(occupancy_compatible),
+            "size_similarity": np.asarray(size_similarity),
+        }
+
+    def score(
+        self, tvl_rooms: List[RoomData], comp_rooms: List[RoomData]
+    ) -> np.ndarray:
+        """Match probability of each aligned room pair"""
+        if not tvl_rooms:
+            return np.zeros(0)
+        z = np.full(len(tvl_rooms), self.weights["bias"])
+        for name, column in self.features(tvl_rooms, comp_rooms).items():
+            z += self.weights[name] * column
+        return 1 / (1 + np.exp(-z))
+
+    def decisions(
+        self, tvl_rooms: List[RoomData], comp_rooms: List[RoomData]
+    ) -> List[Tuple[str, float]]:
+        """(decision, confidence_score) for each aligned room pair"""
+        probabilities = self.score(tvl_rooms, comp_rooms)
+        return [
+            ("matched", float(p)) if p >= self.threshold else ("mismatched", float(1 - p))
+            for p in probabilities
+        ]
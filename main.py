@@ -1,11 +1,16 @@
-from google import genai
+def main():
+    from google import genai
 
-client = genai.Client(
-    vertexai=True, project="tvlk-shared-services-stg", location="global"
-)
+    client = genai.Client(
+        vertexai=True, project="tvlk-shared-services-stg", location="global"
+    )
 
-response = client.models.generate_content(
-    model="gemini-2.5-flash", contents="Write a haiku about sunrise."
-)
+    response = client.models.generate_content(
+        model="gemini-2.5-flash", contents="Write a haiku about sunrise."
+    )
 
-print(response.text)
+    print(response.text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from room_data import MatchResult, RoomData
+from room_matcher import DecisionCache, RoomMatcher
+
+
+class MicroBatcher:
+    """Coalesces single pair requests into micro-batches
+
+    Requests arriving within `window_ms` of the first queued one (up to
+    `max_batch`) form a batch. Identical pairs in a batch are judged once and
+    the distinct pairs fan out over a shared pool that reuses the matcher's
+    warm client; the matcher's decision cache answers repeats across batches.
+    """
+
+    def __init__(
+        self,
+        matcher: RoomMatcher,
+        window_ms: float = 10.0,
+        max_batch: int = 32,
+        workers: int = 16,
+    ):
+        self.matcher = matcher
+        self.window_s = window_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.pairs = 0
+        self.unique_pairs = 0
+        self._judge = matcher._get_pair_judge()
+        self._queue: "queue.Queue[Tuple[Dict[str, Any], Future]]" = queue.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="judge")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Dict[str, Any]) -> Future:
+        """Queue one benchmark-schema item and return a future of its result"""
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.window_s
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[Dict[str, Any], Future]]):
+        """Group identical pairs of a batch and judge each distinct one once"""
+        groups: Dict[Tuple[Any, ...], List[Tuple[RoomData, RoomData, Future]]] = {}
+        for item, future in batch:
+            # A malformed item fails its own future, never the batcher thread
+            try:
+                tvl_room = RoomData.from_dict(item, "tvl")
+                comp_room = RoomData.from_dict(item, "competitor")
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            key = DecisionCache.make_key(
+                self.matcher.model,
+                self.matcher.prompt_mode,
+                self.matcher.thinking_budget,
+                tvl_room,
+                comp_room,
+            )
+            groups.setdefault(key, []).append((tvl_room, comp_room, future))
+
+        self.batches += 1
+        self.pairs += len(batch)
+        self.unique_pairs += len(groups)
+        for members in groups.values():
+            self._pool.submit(self._judge_group, members)
+
+    def _judge_group(self, members: List[Tuple[RoomData, RoomData, Future]]):
+        tvl_room, comp_room, _ = members[0]
+        record: Dict[str, Any] = {}
+        try:
+            if self._judge is None:
+                raise RuntimeError("No LLM client available")
+            match_result = self._judge(tvl_room, comp_room, record)
+        except Exception as e:
+            for _, _, future in members:
+                future.set_exception(e)
+            return
+
+        for member_tvl, member_comp, future in members:
+            future.set_result(
+                {
+                    "decision": match_result.decision,
+                    # Members share prompt inputs but may differ in size
+                    "size_correct": MatchResult._calculate_size_correct(
+                        member_tvl.size, member_comp.size
+                    ),
+                    "confidence_score": match_result.confidence_score,
+                    "reasoning": match_result.reasoning,
+                    "cache_hit": record.get("cache_hit", False),
+                    "latency_s": record.get("latency_s", 0.0),
+                }
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        cache = self.matcher.decision_cache
+        return {
+            "batches": self.batches,
+            "pairs": self.pairs,
+            "unique_pairs": self.unique_pairs,
+            "avg_batch_size": self.pairs / self.batches if self.batches else 0.0,
+            "cache_entries": len(cache) if cache is not None else 0,
+            "cache_hits": cache.hits if cache is not None else 0,
+            "cache_misses": cache.misses if cache is not None else 0,
+        }
+
+
+class MatchServer(ThreadingHTTPServer):
+    """Threaded HTTP server with a listen backlog sized for load tests"""
+
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def make_handler(batcher: MicroBatcher, timeout_s: float):
+    """Build the HTTP handler class bound to a batcher"""
+
+    class MatchHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: Dict[str, Any]):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self._send_json(200, batcher.stats())
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            """POST /match with {"items": [<benchmark item>, ...]}"""
+            if self.path != "/match":
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                items = json.loads(self.rfile.read(length))["items"]
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {"error": f"Invalid request: {e}"})
+                return
+            if not isinstance(items, list) or not all(
+                isinstance(item, dict) for item in items
+            ):
+                self._send_json(
+                    400, {"error": "Invalid request: items must be a list of objects"}
+                )
+                return
+
+            futures = [batcher.submit(item) for item in items]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result(timeout=timeout_s))
+                except Exception as e:
+                    results.append({"error": str(e)})
+            self._send_json(200, {"results": results})
+
+        def log_message(self, format, *args):
+            pass
+
+    return MatchHandler
+
+
+def create_server(
+    matcher: RoomMatcher,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    window_ms: float = 10.0,
+    max_batch: int = 32,
+    workers: int = 16,
+    timeout_s: float = 60.0,
+) -> Tuple[MatchServer, MicroBatcher]:
+    """Create (but do not start) the matching HTTP server"""
+    batcher = MicroBatcher(matcher, window_ms, max_batch, workers)
+    server = MatchServer((host, port), make_handler(batcher, timeout_s))
+    return server, batcher
+
+
+def build_matcher(mock: bool, mock_latency_ms: float = 300.0) -> RoomMatcher:
+    """RoomMatcher with a decision cache, backed by Vertex or the mock LLM"""
+    client = None
+    if mock:
+        from mock_llm import MockGenAIClient
+
+        client = MockGenAIClient(latency_ms=mock_latency_ms)
+    return RoomMatcher(decision_cache=DecisionCache(), client=client)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the micro-batching room matching service"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--window-ms", type=float, default=10.0)
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--mock", action="store_true", help="Use the local mock LLM")
+    parser.add_argument("--mock-latency-ms", type=float, default=300.0)
+    args = parser.parse_args(argv)
+
+    matcher = build_matcher(args.mock, args.mock_latency_ms)
+    server, _ = create_server(
+        matcher, args.host, args.port, args.window_ms, args.max_batch, args.workers
+    )
+    print(
+        f"Matching service on http://{args.host}:{server.server_port} "
+        f"({'mock' if args.mock else matcher.model} backend)",
+        file=sys.stderr,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Optional
+
+from room_blocking import normalize_tokens
+
+_NAME_LINE = re.compile(r"^- Name: (.*)$", re.MULTILINE)
+
+
+class _MockModels:
+    """Stand-in for `client.models` that answers without the network"""
+
+    def __init__(
+        self,
+        latency_ms: float,
+        jitter: float,
+        error_rate: float,
+        seed: Optional[int],
+    ):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate_content(self, model: str, contents: Any, config: Any = None):
+        """Sleep for a log-normal latency and return a <match_result> reply"""
+        with self._lock:
+            self.calls += 1
+            delay = self.latency_ms / 1000 * self._random.lognormvariate(0, self.jitter)
+            fail = self._random.random() < self.error_rate
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError("429 RESOURCE_EXHAUSTED (mock)")
+
+        text = contents if isinstance(contents, str) else str(contents)
+        names = _NAME_LINE.findall(text)
+        tvl_tokens = normalize_tokens(names[0] if names else "")
+        comp_tokens = normalize_tokens(names[1] if len(names) > 1 else "")
+        union = tvl_tokens | comp_tokens
+        overlap = len(tvl_tokens & comp_tokens) / len(union) if union else 0.0
+        decision = "matched" if overlap >= 0.3 else "mismatched"
+        confidence = 0.5 + abs(overlap - 0.3)
+
+        system_instruction = getattr(config, "system_instruction", None) or ""
+        cached_content = getattr(config, "cached_content", None)
+        cached_tokens = 700 if cached_content else 0
+        return SimpleNamespace(
+            text=(
+                "<match_result>\n"
+                f"  <decision>{decision}</decision>\n"
+                f"  <confidence_score>{min(confidence, 1.0):.2f}</confidence_score>\n"
+                f"  <reasoning>Mock judgment, name token overlap {overlap:.2f}</reasoning>\n"
+                "</match_result>"
+            ),
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=(len(text) + len(system_instruction)) // 4
+                + cached_tokens,
+                cached_content_token_count=cached_tokens,
+                candidates_token_count=40,
+                thoughts_token_count=0,
+            ),
+        )
+
+
+class MockGenAIClient:
+    """Local mock of the google-genai client used by RoomMatcher
+
+    Decisions come from name token overlap, latency is log-normal around
+    `latency_ms`, and `error_rate` of the calls raise a throttling error.
+    Pass it as `RoomMatcher(client=MockGenAIClient())` to exercise the LLM
+    code paths without Vertex credentials or cost.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 300.0,
+        jitter: float = 0.5,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.models = _MockModels(latency_ms, jitter, error_rate, seed)
+        self.caches = SimpleNamespace(
+            create=lambda model, config=None: SimpleNamespace(
+                name="cachedContents/mock-rules"
+            )
+        )
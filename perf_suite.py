@@ -0,0 +1,258 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmark import BENCHMARK_FIELDS, DataProcessor, Evaluator
+from mock_llm import MockGenAIClient
+from room_data import MatchResult, RoomData
+from room_matcher import RoomMatcher
+from startup_benchmark import measure_import
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATASET = os.path.join(REPO_DIR, "data", "xrm_sample_1600_datapoints_v2.json")
+DEFAULT_BASELINE = os.path.join(REPO_DIR, "output", "perf_baseline.json")
+
+# Pairs sent through the mock LLM in the end-to-end case
+E2E_PAIRS = 200
+
+XML_RESPONSES = [
+    "<match_result>\n  <decision>matched</decision>\n"
+    "  <confidence_score>0.92</confidence_score>\n"
+    "  <reasoning>Same tier and bed type, sizes within 10%</reasoning>\n"
+    "</match_result>",
+    "Thinking first...\n<match_result><decision>mismatched</decision>"
+    "<confidence_score>0.35</confidence_score>"
+    "<reasoning>Suite vs standard room</reasoning></match_result>",
+    "decision: matched, confidence 0.8",  # falls back to the text parser
+]
+
+# A case returns (callable to time, items processed per call)
+Case = Callable[[List[Dict[str, Any]]], Tuple[Callable[[], Any], int]]
+
+
+def case_from_dict(data: List[Dict[str, Any]]):
+    def run():
+        for item in data:
+            RoomData.from_dict(item, "tvl")
+            RoomData.from_dict(item, "competitor")
+
+    return run, 2 * len(data)
+
+
+def case_xml_parse(data: List[Dict[str, Any]]):
+    rooms = [
+        (RoomData.from_dict(item, "tvl"), RoomData.from_dict(item, "competitor"))
+        for item in data[:300]
+    ]
+
+    def run():
+        for k, (tvl_room, comp_room) in enumerate(rooms):
+            MatchResult.from_llm_xml_response(
+                XML_RESPONSES[k % len(XML_RESPONSES)], tvl_room, comp_room
+            )
+
+    return run, len(rooms)
+
+
+def case_size_correct(data: List[Dict[str, Any]]):
+    sizes = [
+        (RoomData.from_dict(item, "tvl").size, RoomData.from_dict(item, "competitor").size)
+        for item in data
+    ]
+
+    def run():
+        for tvl_size, comp_size in sizes:
+            MatchResult._calculate_size_correct(tvl_size, comp_size)
+
+    return run, len(sizes)
+
+
+def case_filter_valid(data: List[Dict[str, Any]]):
+    return lambda: DataProcessor.filter_valid_data(data), len(data)
+
+
+def case_deduplicate(data: List[Dict[str, Any]]):
+    valid = DataProcessor.filter_valid_data(data)
+    return lambda: DataProcessor.deduplicate_data(valid), len(valid)
+
+
+def case_calculate_metrics(data: List[Dict[str, Any]]):
+    results = RoomMatcher().original_solution(data)
+    evaluator = Evaluator()
+    return lambda: evaluator._calculate_metrics(results), len(results)
+
+
+def case_e2e_mock_llm(data: List[Dict[str, Any]]):
+    """llm_solution against a zero-latency mock, so only our own code is timed"""
+    subset = data[:E2E_PAIRS]
+    matcher = RoomMatcher(client=MockGenAIClient(latency_ms=0, seed=0))
+
+    return lambda: matcher.llm_solution(subset), len(subset)
+
+
+CASES: Dict[str, Case] = {
+    "room_data.from_dict": case_from_dict,
+    "match_result.from_llm_xml_response": case_xml_parse,
+    "match_result._calculate_size_correct": case_size_correct,
+    "data_processor.filter_valid_data": case_filter_valid,
+    "data_processor.deduplicate_data": case_deduplicate,
+    "evaluator._calculate_metrics": case_calculate_metrics,
+    "e2e.llm_solution_mock": case_e2e_mock_llm,
+}
+
+
+def time_case(run: Callable[[], Any], items: int, repeat: int) -> float:
+    """Best-of-`repeat` time per item in microseconds, after one warm-up call
+
+    Output of the timed code (log lines) is part of the cost but discarded.
+    """
+    best = float("inf")
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+        io.StringIO()
+    ):
+        run()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            best = min(best, time.perf_counter() - start)
+    return best / items * 1e6
+
+
+def run_suite(
+    data: List[Dict[str, Any]], repeat: int, only: Optional[str], startup: bool
+) -> Dict[str, Dict[str, Any]]:
+    """Measure every selected case, {name: {"value": float, "unit": str}}"""
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, case in CASES.items():
+        if only and only not in name:
+            continue
+        run, items = case(data)
+        results[name] = {"value": time_case(run, items, repeat), "unit": "us/item"}
+        print(f"  {name:<40} {results[name]['value']:10.2f} us/item", file=sys.stderr)
+
+    if startup and (not only or only in "import.room_matcher"):
+        samples = []
+        for _ in range(repeat):
+            entries = measure_import("room_matcher")
+            samples.append(next(c for n, _, c in entries if n == "room_matcher") / 1000)
+        results["import.room_matcher"] = {"value": min(samples), "unit": "ms"}
+        print(f"  {'import.room_matcher':<40} {min(samples):10.2f} ms", file=sys.stderr)
+    return results
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️ Error loading baseline {path}: {e}", file=sys.stderr)
+        return None
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, Any]]):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "cases": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"Baseline written to {path}", file=sys.stderr)
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Optional[Dict[str, Any]],
+    tolerance: float,
+) -> List[str]:
+    """Print the comparison report and return the regressed case names"""
+    baseline_cases = baseline["cases"] if baseline else {}
+    regressions = []
+
+    print("\n=== Performance Report ===")
+    if baseline:
+        print(
+            f"Baseline: {baseline.get('created', '?')} "
+            f"(Python {baseline.get('python', '?')}), tolerance ±{tolerance * 100:.0f}%"
+        )
+    header = f"{'Case':<40} {'Baseline':>17} {'Current':>17} {'Change':>8}  Status"
+    print(header)
+    print("-" * len(header))
+    for name, current in results.items():
+        unit = current["unit"]
+        previous = baseline_cases.get(name)
+        if previous is None:
+            print(f"{name:<40} {'-':>17} {current['value']:>9.2f} {unit:<7} {'':>8}  NEW")
+            continue
+
+        change = current["value"] / previous["value"] - 1 if previous["value"] else 0.0
+        status = "OK"
+        if change > tolerance:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif change < -tolerance:
+            status = "IMPROVED"
+        print(
+            f"{name:<40} {previous['value']:>9.2f} {unit:<7} "
+            f"{current['value']:>9.2f} {unit:<7} {change * 100:>+7.1f}%  {status}"
+        )
+    print("=" * 50)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None):
+    """Time the hot paths and flag regressions against a stored baseline"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--dataset", default=DEFAULT_DATASET)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store this run as the new baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Relative slowdown flagged as a regression (0.2 = 20%%)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="Run only cases whose name contains this")
+    parser.add_argument(
+        "--no-startup", action="store_true", help="Skip the import time case"
+    )
+    args = parser.parse_args(argv)
+
+    data = DataProcessor.load_data(args.dataset, fields=BENCHMARK_FIELDS)
+    if not data:
+        print(f"❌ No data loaded from {args.dataset}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"Running performance suite on {len(data)} items...", file=sys.stderr)
+    results = run_suite(data, args.repeat, args.only, not args.no_startup)
+    regressions = compare(results, load_baseline(args.baseline), args.tolerance)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+    elif regressions:
+        print(f"❌ Regressions: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
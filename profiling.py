@@ -0,0 +1,151 @@
+import io
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional
+
+_NO_STAGE = nullcontext()
+
+# cProfile, pstats and tracemalloc are imported by StageProfiler only, so
+# modules calling stage() do not pay for them at startup
+
+# Profiler receiving stage() timings, None when profiling is off
+_active: Optional["StageProfiler"] = None
+
+
+def stage(name: str):
+    """Time a block under `name` if a StageProfiler is active, else no-op"""
+    if _active is None:
+        return _NO_STAGE
+    return _active.stage(name)
+
+
+class StageProfiler:
+    """Per-stage wall time and memory of a benchmark run
+
+    Stages may nest and repeat (e.g. "llm.network" once per pair); each name
+    accumulates its call count and total time. With `trace_memory`, top-level
+    stages also record the net allocation and peak traced memory (tracemalloc
+    slows the run down, so timings are then inflated). With `cprofile`, the
+    whole run is profiled and the stats are written as a .prof file, which
+    snakeviz, flameprof or gprof2dot turn into a flamegraph.
+    """
+
+    def __init__(self, trace_memory: bool = False, cprofile: bool = False):
+        import cProfile
+        import tracemalloc
+
+        self._tracemalloc = tracemalloc
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        # Stages may be entered from worker threads (e.g. concurrent solutions)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiler = cProfile.Profile() if cprofile else None
+        self._start_time = 0.0
+        self.total_s = 0.0
+
+    def start(self):
+        global _active
+        _active = self
+        if self.trace_memory:
+            self._tracemalloc.start()
+        if self._profiler is not None:
+            self._profiler.enable()
+        self._start_time = time.perf_counter()
+
+    def stop(self):
+        global _active
+        self.total_s = time.perf_counter() - self._start_time
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self.trace_memory:
+            self._tracemalloc.stop()
+        _active = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        depth = getattr(self._local, "depth", 0)
+        with self._lock:
+            entry = self.stages.setdefault(
+                name, {"calls": 0, "total_s": 0.0, "depth": depth}
+            )
+        track_memory = (
+            self.trace_memory
+            and depth == 0
+            and threading.current_thread() is threading.main_thread()
+        )
+        if track_memory:
+            memory_before = self._tracemalloc.get_traced_memory()[0]
+            self._tracemalloc.reset_peak()
+        self._local.depth = depth + 1
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self._local.depth = depth
+            with self._lock:
+                entry["calls"] += 1
+                entry["total_s"] += elapsed
+            if track_memory:
+                current, peak = self._tracemalloc.get_traced_memory()
+                entry["net_alloc_bytes"] = (
+                    entry.get("net_alloc_bytes", 0) + current - memory_before
+                )
+                entry["peak_bytes"] = max(entry.get("peak_bytes", 0), peak)
+
+    def top_functions(self, limit: int = 15) -> str:
+        """cProfile listing of the functions with the highest own time"""
+        if self._profiler is None:
+            return ""
+        import pstats
+
+        stream = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=stream)
+        stats.sort_stats("tottime").print_stats(limit)
+        return stream.getvalue()
+
+    def print_report(self):
+        """Print the per-stage breakdown in execution order"""
+        print("\n=== Profile ===")
+        print(f"Total wall time: {self.total_s:.3f}s")
+        header = f"{'Stage':<40} {'Calls':>7} {'Total s':>9} {'Avg ms':>9} {'% run':>6}"
+        if self.trace_memory:
+            header += f" {'Net MiB':>8} {'Peak MiB':>9}"
+        print(header)
+        print("-" * len(header))
+        for name, entry in self.stages.items():
+            line = (
+                f"{'  ' * entry['depth'] + name:<40} {entry['calls']:>7} "
+                f"{entry['total_s']:>9.3f} "
+                f"{entry['total_s'] / entry['calls'] * 1000:>9.2f} "
+                f"{entry['total_s'] / self.total_s * 100 if self.total_s else 0:>5.1f}%"
+            )
+            if "peak_bytes" in entry:
+                line += (
+                    f" {entry['net_alloc_bytes'] / 2**20:>8.2f}"
+                    f" {entry['peak_bytes'] / 2**20:>9.2f}"
+                )
+            print(line)
+        top = self.top_functions()
+        if top:
+            print("\nTop functions by own time (cProfile):")
+            print(top)
+        print("=" * 50)
+
+    def write(self, path_prefix: str) -> List[str]:
+        """Write <prefix>_profile.json (and <prefix>.prof with cProfile)"""
+        written = [f"{path_prefix}_profile.json"]
+        with open(written[0], "w", encoding="utf-8") as f:
+            json.dump(
+                {"total_s": self.total_s, "stages": self.stages}, f, indent=2
+            )
+        if self._profiler is not None:
+            written.append(f"{path_prefix}.prof")
+            self._profiler.dump_stats(written[-1])
+        for path in written:
+            print(f"Profile written to {path}", file=sys.stderr)
+        return written
@@ -0,0 +1,202 @@
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from room_data import RoomData
+
+# Room type tiers from the matching rules, lowest to highest
+TIER_KEYWORDS: Dict[str, int] = {
+    "basic": 0,
+    "standard": 0,
+    "classic": 0,
+    "superior": 1,
+    "comfort": 1,
+    "plus": 1,
+    "deluxe": 2,
+    "premium": 2,
+    "executive": 3,
+    "club": 3,
+    "suite": 4,
+    "villa": 5,
+    "penthouse": 5,
+    "apartment": 5,
+}
+
+# Marketing and view words the matching rules say to ignore
+IGNORED_WORDS = frozenset(
+    {
+        "premier",
+        "grand",
+        "luxury",
+        "social",
+        "corner",
+        "city",
+        "garden",
+        "romantic",
+        "modern",
+        "view",
+        "river",
+        "mountain",
+        "sea",
+        "ocean",
+        "room",
+        "with",
+        "and",
+        "the",
+        "non",
+        "smoking",
+    }
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_tokens(name: Optional[str]) -> FrozenSet[str]:
+    """Lower-case word tokens of a room name without ignored words"""
+    if not name:
+        return frozenset()
+    return frozenset(
+        token for token in _TOKEN.findall(name.lower()) if token not in IGNORED_WORDS
+    )
+
+
+def room_tier(tokens: FrozenSet[str]) -> Optional[int]:
+    """Highest room type tier named in the tokens, None if no tier word"""
+    tiers = [TIER_KEYWORDS[token] for token in tokens if token in TIER_KEYWORDS]
+    return max(tiers) if tiers else None
+
+
+_LARGE_BEDS = ("king", "queen", "double", "full")
+_MULTIPLE = ("2", "3", "4", "two", "three", "four")
+
+
+def bed_categories(bed_type: Optional[str]) -> FrozenSet[str]:
+    """Bed arrangements offered by a bed type: "double", "twin" or "single"
+
+    Handles both TVL codes (ONE_KING_BED, TWO_SINGLE_BED) and competitor
+    text ("1 king bed or 2 single beds"); unknown values give an empty set.
+    """
+    if not bed_type:
+        return frozenset()
+    categories = set()
+    for option in bed_type.lower().replace("_", " ").split(" or "):
+        words = option.split()
+        if any(word in _LARGE_BEDS for word in words):
+            categories.add("double")
+        elif "twin" in words or (
+            "single" in words and any(word in _MULTIPLE for word in words)
+        ):
+            categories.add("twin")
+        elif "single" in words:
+            categories.add("single")
+    return frozenset(categories)
+
+
+def size_spd(size_a: Optional[float], size_b: Optional[float]) -> Optional[float]:
+    """Symmetrized percent difference of two sizes, None if either is missing"""
+    if not size_a or not size_b:
+        return None
+    return 2 * abs(size_a - size_b) / (size_a + size_b)
+
+
+@dataclass
+class RoomKey:
+    """Cheap features of one room used for blocking"""
+
+    __slots__ = ("tier", "tokens", "occupancy", "size")
+
+    tier: Optional[int]
+    tokens: FrozenSet[str]
+    occupancy: Optional[int]
+    size: Optional[float]
+
+    @classmethod
+    def from_room(cls, room: RoomData) -> "RoomKey":
+        tokens = normalize_tokens(room.name)
+        return cls(room_tier(tokens), tokens, room.occupancy, room.size)
+
+
+class CandidateBlocker:
+    """Prunes TVL × competitor room pairs before any expensive judgment
+
+    A pair is kept when its occupancy differs by at most `max_occupancy_gap`,
+    its size SPD is at most `max_size_spd`, and the names look related: tiers
+    at most `max_tier_gap` apart, a shared name token, or sizes within
+    `size_match_spd` (the size_correct threshold). Missing occupancy or size
+    never prunes a pair on its own.
+    """
+
+    def __init__(
+        self,
+        max_tier_gap: int = 1,
+        max_occupancy_gap: int = 2,
+        max_size_spd: float = 0.5,
+        size_match_spd: float = 0.2,
+    ):
+        self.max_tier_gap = max_tier_gap
+        self.max_occupancy_gap = max_occupancy_gap
+        self.max_size_spd = max_size_spd
+        self.size_match_spd = size_match_spd
+
+    def candidate_pairs(
+        self, tvl_rooms: List[RoomData], comp_rooms: List[RoomData]
+    ) -> List[Tuple[int, int]]:
+        """Return (tvl_index, comp_index) pairs that survive blocking"""
+        comp_keys = [RoomKey.from_room(room) for room in comp_rooms]
+
+        # Index competitor rooms by tier, by name token and by size, so each
+        # TVL room only visits rooms that can pass the related-name or the
+        # size-match check
+        by_tier: Dict[Optional[int], List[int]] = {}
+        by_token: Dict[str, List[int]] = {}
+        for j, key in enumerate(comp_keys):
+            by_tier.setdefault(key.tier, []).append(j)
+            for token in key.tokens:
+                by_token.setdefault(token, []).append(j)
+        sized = sorted((key.size, j) for j, key in enumerate(comp_keys) if key.size)
+        sizes = [size for size, _ in sized]
+
+        # spd(a, b) <= t  <=>  a * (2 - t) / (2 + t) <= b <= a * (2 + t) / (2 - t)
+        t = self.size_match_spd
+        low_factor, high_factor = (2 - t) / (2 + t), (2 + t) / (2 - t)
+
+        pairs = []
+        for i, room in enumerate(tvl_rooms):
+            tvl_key = RoomKey.from_room(room)
+
+            related = set()
+            if tvl_key.tier is not None:
+                for tier in range(
+                    tvl_key.tier - self.max_tier_gap,
+                    tvl_key.tier + self.max_tier_gap + 1,
+                ):
+                    related.update(by_tier.get(tier, ()))
+            for token in tvl_key.tokens:
+                related.update(by_token.get(token, ()))
+
+            candidates = set(related)
+            if tvl_key.size:
+                # Widened slightly; _keep applies the exact threshold
+                start = bisect_left(sizes, tvl_key.size * low_factor * (1 - 1e-9))
+                end = bisect_right(sizes, tvl_key.size * high_factor * (1 + 1e-9))
+                candidates.update(j for _, j in sized[start:end])
+
+            for j in sorted(candidates):
+                if self._keep(tvl_key, comp_keys[j], j in related):
+                    pairs.append((i, j))
+
+        return pairs
+
+    def _keep(self, tvl_key: RoomKey, comp_key: RoomKey, related: bool) -> bool:
+        """Check the occupancy and size rules for one pair"""
+        if tvl_key.occupancy is not None and comp_key.occupancy is not None:
+            if abs(tvl_key.occupancy - comp_key.occupancy) > self.max_occupancy_gap:
+                return False
+
+        spd = size_spd(tvl_key.size, comp_key.size)
+        if spd is None:
+            return related
+        if spd > self.max_size_spd:
+            return False
+        return related or spd <= self.size_match_spd
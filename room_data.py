@@ -1,12 +1,72 @@
 from typing import Any, Dict, Optional
 import json
+import sys
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass
 
 
+def _parse_float(value: Any) -> Optional[float]:
+    """Parse a positive float, returning None for missing or invalid values"""
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return None
+    return number if number > 0 else None
+
+
+def _parse_int(value: Any) -> Optional[int]:
+    """Parse an integer such as "3" or "3.0", returning None if invalid"""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        pass
+    try:
+        return int(float(value))
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+def _parse_bool(value: Any) -> Optional[bool]:
+    """Parse a boolean flag stored as bool or as "true"/"false" strings"""
+    if value is None or value is True or value is False:
+        return value
+    text = str(value).strip().lower()
+    if text == "true":
+        return True
+    if text == "false":
+        return False
+    return None
+
+
+def _intern(value: Any) -> Optional[str]:
+    """Intern categorical strings so repeated codes share a single object"""
+    if value is None:
+        return None
+    return sys.intern(str(value))
+
+
 @dataclass
 class RoomData:
-    """Structured room data"""
+    """Structured room data
+
+    Slotted to avoid a per-instance __dict__; categorical fields (bed type,
+    cancellation policy code) are interned, so equal values are the same
+    object and compare by identity first.
+    """
+
+    __slots__ = (
+        "name",
+        "size",
+        "bed_type",
+        "occupancy",
+        "breakfast",
+        "refundable",
+        "cancellation_policy_code",
+    )
 
     name: str
     size: Optional[float]
@@ -24,25 +84,16 @@ class RoomData:
         soft_metrics = metrics.get("soft_metrics", {})
         amenities = soft_metrics.get("amenities", {})
 
-        # Parse size safely
-        size_str = hard_metrics.get("room_size")
-        size = None
-        if size_str is not None:
-            try:
-                size = float(size_str)
-                if size <= 0:
-                    size = None
-            except (ValueError, TypeError):
-                size = None
-
         return cls(
             name=soft_metrics.get("room_group_name", ""),
-            size=size,
-            bed_type=soft_metrics.get("bed_type"),
-            occupancy=soft_metrics.get("max_occupancy"),
-            breakfast=amenities.get("is_with_breakfast"),
-            refundable=amenities.get("is_refundable"),
-            cancellation_policy_code=amenities.get("cancellation_policy_code"),
+            size=_parse_float(hard_metrics.get("room_size")),
+            bed_type=_intern(soft_metrics.get("bed_type")),
+            occupancy=_parse_int(soft_metrics.get("max_occupancy")),
+            breakfast=_parse_bool(amenities.get("is_with_breakfast")),
+            refundable=_parse_bool(amenities.get("is_refundable")),
+            cancellation_policy_code=_intern(
+                amenities.get("cancellation_policy_code")
+            ),
         )
 
 
@@ -50,6 +101,8 @@ class RoomData:
 class MatchResult:
     """Result of room matching decision"""
 
+    __slots__ = ("decision", "size_correct", "confidence_score", "reasoning")
+
     decision: str
     size_correct: bool
     confidence_score: float
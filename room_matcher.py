@@ -1,37 +1,48 @@
+import hashlib
+import json
 import sys
-from typing import Any, Dict, List
-
-from google.genai import types
-
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from profiling import stage
+from room_blocking import CandidateBlocker, size_spd
 from room_data import MatchResult, RoomData
 
-
-class RoomMatcher:
-    """Hotel room matching system"""
-
-    def __init__(self):
-        self._client = None
-
-    def _get_client(self):
-        """Lazy initialization of Google GenAI client"""
-        if self._client is None:
-            try:
-                from google import genai
-
-                self._client = genai.Client(
-                    vertexai=True, project="tvlk-shared-services-stg", location="global"
-                )
-            except ImportError:
-                print(
-                    "⚠️ google-genai not installed, fallback to original solution",
-                    file=sys.stderr,
-                )
-                self._client = False
-        return self._client
-
-    def _create_prompt(self, tvl_room: RoomData, comp_room: RoomData) -> str:
-        """Create matching prompt for LLM"""
-        return f"""
+DEFAULT_MODEL = "gemini-2.5-flash"
+
+# Pseudo model name for the local similarity scorer (no LLM call)
+LOCAL_MODEL = "local"
+
+# How the static matching rules are sent to the model:
+# - full: rules and room block in every request (original behaviour)
+# - system_instruction: rules as system instruction, room block as contents
+# - cached: rules uploaded once as cached content, room block per request
+PROMPT_MODES = ("full", "system_instruction", "cached")
+
+# USD per 1M tokens (Vertex AI list prices, prompts <= 200k tokens).
+# Thinking tokens are billed as output. Cache storage is billed separately
+# per hour and is not included here.
+MODEL_PRICING: Dict[str, Dict[str, float]] = {
+    "gemini-2.5-flash": {"input": 0.30, "cached_input": 0.03, "output": 2.50},
+    "gemini-2.5-flash-lite": {"input": 0.10, "cached_input": 0.01, "output": 0.40},
+    "gemini-2.5-pro": {"input": 1.25, "cached_input": 0.125, "output": 10.00},
+}
+
+# Per-call usage fields that add up when one item needs several calls
+USAGE_TOTAL_KEYS = (
+    "latency_s",
+    "unhedged_latency_s",
+    "prompt_tokens",
+    "cached_tokens",
+    "output_tokens",
+    "cost_usd",
+)
+
+# Static part of the matching prompt, identical for every pair
+RULES_PROMPT = """
 You☎️ are a hotel room matching expert. Judge whether two rooms from different sources should be considered the same room type based on human-friendly understanding.
 
 ## Matching Rules (By Priority)
@@ -101,7 +112,253 @@ Output an XML structure with the following format:
 The decision should be either "matched" or "mismatched".
 The confidence_score should be a decimal between 0.0 and 1.0.
 The reasoning should be a brief explanation of the decision based on the rules above.
+"""
 
+
+def _fingerprint(*parts: Any) -> str:
+    """Short stable hash of JSON-serializable parts"""
+    encoded = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+class HedgingPolicy:
+    """Decides when a slow LLM call gets a duplicate (hedged) request
+
+    The hedge delay is the given percentile of recently observed call
+    latencies; no hedges are sent until `min_samples` calls have completed,
+    and the share of hedged requests never exceeds `max_hedge_rate`.
+    """
+
+    def __init__(
+        self,
+        max_hedge_rate: float = 0.1,
+        percentile: float = 95,
+        min_samples: int = 20,
+        window: int = 200,
+    ):
+        self.max_hedge_rate = max_hedge_rate
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedges = 0
+        self._latencies: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def start_request(self) -> Optional[float]:
+        """Count a new request and return its hedge delay (None: no hedging)"""
+        with self._lock:
+            self.requests += 1
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        rank = round(self.percentile / 100 * len(latencies)) - 1
+        return latencies[max(0, min(len(latencies) - 1, rank))]
+
+    def try_hedge(self) -> bool:
+        """Reserve a hedge if the hedge rate cap allows it"""
+        with self._lock:
+            if self.hedges + 1 > self.max_hedge_rate * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def record(self, latency_s: float):
+        """Record the latency of a completed call"""
+        with self._lock:
+            self._latencies.append(latency_s)
+
+
+class DecisionCache:
+    """Thread-safe LRU cache of LLM decisions keyed by the prompt inputs
+
+    Only the decision, confidence and reasoning are cached; size_correct is
+    recomputed from the rooms on every hit. A miss reserves its key until
+    the caller put()s the decision or release()s the key; concurrent get()s
+    of a reserved key wait for that decision, so a pair requested by several
+    threads at once is judged (and paid for) once.
+    """
+
+    def __init__(self, max_size: int = 100_000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[str, float, str]]" = (
+            OrderedDict()
+        )
+        # Keys being judged by the caller that missed on them
+        self._in_flight: Dict[Tuple[Any, ...], threading.Event] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        model: str,
+        prompt_mode: str,
+        thinking_budget: int,
+        tvl_room: RoomData,
+        comp_room: RoomData,
+    ) -> Tuple[Any, ...]:
+        """Key a decision by everything that reaches the prompt"""
+        return (
+            model,
+            prompt_mode,
+            thinking_budget,
+            tvl_room.name,
+            tvl_room.bed_type,
+            tvl_room.occupancy,
+            comp_room.name,
+            comp_room.bed_type,
+            comp_room.occupancy,
+        )
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Tuple[str, float, str]]:
+        """Cached decision, or None: the caller must then put() or release()"""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                judging = self._in_flight.get(key)
+                if judging is None:
+                    self._in_flight[key] = threading.Event()
+                    self.misses += 1
+                    return None
+            # Another caller is judging this key; if it fails, retry as owner
+            judging.wait()
+
+    def put(self, key: Tuple[Any, ...], match_result: MatchResult):
+        with self._lock:
+            self._entries[key] = (
+                match_result.decision,
+                match_result.confidence_score,
+                match_result.reasoning,
+            )
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            judging = self._in_flight.pop(key, None)
+        if judging is not None:
+            judging.set()
+
+    def release(self, key: Tuple[Any, ...]):
+        """Drop a get() reservation without a decision (the call failed)"""
+        with self._lock:
+            judging = self._in_flight.pop(key, None)
+        if judging is not None:
+            judging.set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ContextCacheRegistry:
+    """Thread-safe registry of the rules context cache of each model
+
+    Creation is serialized, so concurrent callers that miss on the same
+    model upload (and pay for) a single cache. A cache is re-created
+    `refresh_margin_s` before its TTL runs out (at most half the TTL), so
+    long runs and services never send requests to an expired cache. Share
+    one registry between matchers that should reuse each other's caches.
+    """
+
+    def __init__(self, refresh_margin_s: float = 60.0):
+        self.refresh_margin_s = refresh_margin_s
+        # model -> (cache name or False after a failed creation, refresh time)
+        self._caches: Dict[str, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, client, types, model: str, ttl_seconds: int) -> Optional[str]:
+        """Return the cache name for model, creating it when missing or
+        about to expire"""
+        with self._lock:
+            name, refresh_at = self._caches.get(model, (None, 0.0))
+            if name is None or (name and time.monotonic() >= refresh_at):
+                created_at = time.monotonic()
+                try:
+                    cache = client.caches.create(
+                        model=model,
+                        config=types.CreateCachedContentConfig(
+                            display_name="xrm-room-matching-rules",
+                            system_instruction=RULES_PROMPT,
+                            ttl=f"{ttl_seconds}s",
+                        ),
+                    )
+                    name = cache.name
+                    print(f"Created context cache {name}", file=sys.stderr)
+                except Exception as e:
+                    print(
+                        f"⚠️ Context cache creation failed ({e}), "
+                        "fallback to system instruction",
+                        file=sys.stderr,
+                    )
+                    name = False
+                margin = min(self.refresh_margin_s, ttl_seconds / 2)
+                self._caches[model] = (name, created_at + ttl_seconds - margin)
+            return name or None
+
+
+class RoomMatcher:
+    """Hotel room matching system"""
+
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        thinking_budget: int = 0,
+        prompt_mode: str = "full",
+        cache_ttl_seconds: int = 3600,
+        hedging: Optional[HedgingPolicy] = None,
+        decision_cache: Optional[DecisionCache] = None,
+        client=None,
+        local_scorer=None,
+        context_caches: Optional[ContextCacheRegistry] = None,
+    ):
+        if prompt_mode not in PROMPT_MODES:
+            raise ValueError(
+                f"Unknown prompt_mode {prompt_mode!r}, expected one of {PROMPT_MODES}"
+            )
+        self.model = model
+        self.thinking_budget = thinking_budget
+        self.prompt_mode = prompt_mode
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.hedging = hedging
+        self.decision_cache = decision_cache
+        # A pre-built client (e.g. mock_llm.MockGenAIClient) skips Vertex setup
+        self._client = client
+        self.context_caches = (
+            context_caches if context_caches is not None else ContextCacheRegistry()
+        )
+        # Fitted local_scorer.LocalSimilarityScorer shared by local_solution calls
+        self.local_scorer = local_scorer
+        # (primary future, record, hedged latency) of hedged calls whose
+        # primary was still running when the hedge won, see join_primaries()
+        self._running_primaries: List[Tuple[Future, Dict[str, Any], float]] = []
+        self._primaries_lock = threading.Lock()
+
+    def _get_client(self):
+        """Lazy initialization of Google GenAI client"""
+        if self._client is None:
+            try:
+                from google import genai
+
+                self._client = genai.Client(
+                    vertexai=True, project="tvlk-shared-services-stg", location="global"
+                )
+            except ImportError:
+                print(
+                    "⚠️ google-genai not installed, fallback to original solution",
+                    file=sys.stderr,
+                )
+                self._client = False
+        return self._client
+
+    def _get_cached_content(self, client, types, model: str) -> Optional[str]:
+        """Upload the static rules once per model and return the cache name"""
+        return self.context_caches.get(client, types, model, self.cache_ttl_seconds)
+
+    def _create_room_block(self, tvl_room: RoomData, comp_room: RoomData) -> str:
+        """Create the per-pair part of the matching prompt"""
+        return f"""
 ---
 TVL Room:
 - Name: {tvl_room.name}
@@ -114,6 +371,111 @@ Competitor Room:
 - Occupancy: {comp_room.occupancy}
 """
 
+    def _create_prompt(self, tvl_room: RoomData, comp_room: RoomData) -> str:
+        """Create matching prompt for LLM"""
+        return RULES_PROMPT + self._create_room_block(tvl_room, comp_room)
+
+    def prompt_fingerprint(self) -> str:
+        """Short hash of the prompt template and model settings"""
+        placeholder = RoomData("{name}", None, "{bed_type}", None, None, None, None)
+        return _fingerprint(
+            RULES_PROMPT,
+            self._create_room_block(placeholder, placeholder),
+            self.model,
+            self.thinking_budget,
+            self.prompt_mode,
+        )
+
+    def solution_fingerprint(self, solution_name: str) -> str:
+        """Short hash of everything that determines a solution's output"""
+        if solution_name == "llm":
+            return self.prompt_fingerprint()
+        if solution_name == "local":
+            try:
+                from local_scorer import FEATURE_WEIGHTS
+            except ImportError:
+                # local_solution falls back to the original solution
+                return _fingerprint("original")
+            if self.local_scorer is None:
+                raise ValueError(
+                    "fit_local_scorer() must be called before fingerprinting "
+                    "the local solution"
+                )
+            return _fingerprint(
+                "local",
+                FEATURE_WEIGHTS,
+                self.local_scorer.ngram_range,
+                self.local_scorer.corpus_hash,
+            )
+        return _fingerprint(solution_name)
+
+    def _create_request(
+        self,
+        client,
+        types,
+        tvl_room: RoomData,
+        comp_room: RoomData,
+        model: str,
+        thinking_budget: int,
+    ):
+        """Build (contents, config) for one pair according to the prompt mode"""
+        thinking_config = types.ThinkingConfig(thinking_budget=thinking_budget)
+
+        if self.prompt_mode == "full":
+            config = types.GenerateContentConfig(thinking_config=thinking_config)
+            return self._create_prompt(tvl_room, comp_room), config
+
+        room_block = self._create_room_block(tvl_room, comp_room)
+        cached_content = (
+            self._get_cached_content(client, types, model)
+            if self.prompt_mode == "cached"
+            else None
+        )
+        if cached_content:
+            config = types.GenerateContentConfig(
+                cached_content=cached_content, thinking_config=thinking_config
+            )
+        else:
+            config = types.GenerateContentConfig(
+                system_instruction=RULES_PROMPT, thinking_config=thinking_config
+            )
+        return room_block, config
+
+    @staticmethod
+    def _estimate_cost(
+        model: str, prompt_tokens: int, cached_tokens: int, output_tokens: int
+    ) -> float:
+        """Estimate request cost in USD from token counts"""
+        pricing = MODEL_PRICING.get(model)
+        if pricing is None:
+            return 0.0
+        return (
+            (prompt_tokens - cached_tokens) * pricing["input"]
+            + cached_tokens * pricing["cached_input"]
+            + output_tokens * pricing["output"]
+        ) / 1_000_000
+
+    def _usage_fields(
+        self, model: str, response, latency_s: float
+    ) -> Dict[str, Any]:
+        """Extract latency, billed tokens and estimated cost of one call"""
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", None) or 0
+        cached_tokens = getattr(usage, "cached_content_token_count", None) or 0
+        output_tokens = (getattr(usage, "candidates_token_count", None) or 0) + (
+            getattr(usage, "thoughts_token_count", None) or 0
+        )
+        return {
+            "model": model,
+            "latency_s": latency_s,
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,
+            "output_tokens": output_tokens,
+            "cost_usd": self._estimate_cost(
+                model, prompt_tokens, cached_tokens, output_tokens
+            ),
+        }
+
     def original_solution(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Original matching solution"""
         results = []
@@ -136,8 +498,408 @@ Competitor Room:
             results.append(new_item)
         return results
 
+    def _hedged_generate(
+        self, client, model: str, contents, config
+    ) -> Tuple[Any, float, bool, Future]:
+        """Call generate_content, duplicating the call if it runs past the
+        policy's hedge delay; the first response with a <match_result> wins.
+
+        Returns (response, latency_s, hedged, primary future). The primary
+        may still be running when its hedge won; its own latency is what the
+        pair would have waited without hedging.
+
+        Each call gets its own two-worker executor (primary and hedge), so
+        concurrent callers never queue behind each other or behind a losing
+        call that is still running; it is shut down without waiting for
+        the loser.
+        """
+        policy = self.hedging
+
+        def call():
+            call_start = time.perf_counter()
+            response = client.models.generate_content(
+                model=model, contents=contents, config=config
+            )
+            latency = time.perf_counter() - call_start
+            policy.record(latency)
+            return response, latency
+
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="llm-hedge")
+        try:
+            start_time = time.perf_counter()
+            hedge_delay = policy.start_request()
+            primary = executor.submit(call)
+            pending = {primary}
+
+            hedged = False
+            done, _ = wait(pending, timeout=hedge_delay)
+            if not done and policy.try_hedge():
+                pending.add(executor.submit(call))
+                hedged = True
+
+            fallback, last_error = None, None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        response, _ = future.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    if "<match_result>" in (response.text or ""):
+                        latency_s = time.perf_counter() - start_time
+                        return response, latency_s, hedged, primary
+                    fallback = fallback or response
+
+            if fallback is None:
+                raise last_error
+            return fallback, time.perf_counter() - start_time, hedged, primary
+        finally:
+            executor.shutdown(wait=False)
+
+    def _track_primary(
+        self, primary: Future, record: Dict[str, Any], latency_s: float
+    ):
+        """Queue record for an unhedged latency update from its primary call"""
+        with self._primaries_lock:
+            self._running_primaries.append((primary, record, latency_s))
+        self.join_primaries(block=False)
+
+    def join_primaries(self, block: bool = True):
+        """Add the real latency of finished primary calls to their records
+
+        A hedged record starts with unhedged_latency_s set to the hedged
+        latency; once its primary call has finished, the difference to the
+        primary's own latency is added (so sums like the cascade's stay
+        right). With `block`, waits for every primary still running, which
+        reports must do before reading unhedged_latency_s.
+        """
+        with self._primaries_lock:
+            entries, self._running_primaries = self._running_primaries, []
+        running = []
+        for primary, record, latency_s in entries:
+            if not block and not primary.done():
+                running.append((primary, record, latency_s))
+                continue
+            try:
+                primary_latency = primary.result()[1]
+            except Exception:
+                # A failed primary has no latency; keep the hedged one
+                primary_latency = latency_s
+            record["unhedged_latency_s"] += (
+                max(primary_latency, latency_s) - latency_s
+            )
+        if running:
+            with self._primaries_lock:
+                self._running_primaries.extend(running)
+
+    def _judge_pair(
+        self,
+        client,
+        types,
+        tvl_room: RoomData,
+        comp_room: RoomData,
+        model: str,
+        thinking_budget: int,
+        record: Dict[str, Any],
+    ) -> MatchResult:
+        """Judge one room pair with the LLM; usage fields are added to record"""
+        cache_key = None
+        if self.decision_cache is not None:
+            cache_key = DecisionCache.make_key(
+                model, self.prompt_mode, thinking_budget, tvl_room, comp_room
+            )
+            cached = self.decision_cache.get(cache_key)
+            record["cache_hit"] = cached is not None
+            if cached is not None:
+                decision, confidence_score, reasoning = cached
+                size_correct = MatchResult._calculate_size_correct(
+                    tvl_room.size, comp_room.size
+                )
+                return MatchResult(decision, size_correct, confidence_score, reasoning)
+
+        try:
+            match_result = self._call_llm(
+                client, types, tvl_room, comp_room, model, thinking_budget, record
+            )
+        except BaseException:
+            # Let callers waiting on this key judge it themselves
+            if cache_key is not None:
+                self.decision_cache.release(cache_key)
+            raise
+        if cache_key is not None:
+            self.decision_cache.put(cache_key, match_result)
+        return match_result
+
+    def _call_llm(
+        self,
+        client,
+        types,
+        tvl_room: RoomData,
+        comp_room: RoomData,
+        model: str,
+        thinking_budget: int,
+        record: Dict[str, Any],
+    ) -> MatchResult:
+        """Judge one room pair with an LLM call, bypassing the decision cache"""
+        # Create and send prompt
+        with stage("llm.prompt"):
+            contents, config = self._create_request(
+                client, types, tvl_room, comp_room, model, thinking_budget
+            )
+
+        with stage("llm.network"):
+            if self.hedging is None:
+                start_time = time.perf_counter()
+                response = client.models.generate_content(
+                    model=model, contents=contents, config=config
+                )
+                latency_s = time.perf_counter() - start_time
+                hedged = False
+            else:
+                response, latency_s, hedged, primary = self._hedged_generate(
+                    client, model, contents, config
+                )
+        record.update(self._usage_fields(model, response, latency_s))
+        if self.hedging is not None:
+            record["hedged"] = hedged
+            record["unhedged_latency_s"] = latency_s
+            self._track_primary(primary, record, latency_s)
+            if hedged:
+                # The duplicate request is billed too; assume the same cost
+                record["cost_usd"] *= 2
+
+        # Parse XML response instead of JSON
+        with stage("llm.parse"):
+            return MatchResult.from_llm_xml_response(
+                response.text, tvl_room, comp_room
+            )
+
+    def _judge_item(
+        self,
+        client,
+        types,
+        item: Dict[str, Any],
+        model: str,
+        thinking_budget: int,
+    ) -> Dict[str, Any]:
+        """Judge one dataset item with the LLM and return the annotated copy"""
+        new_item = item.copy()
+        uuid_str = item.get("uuid_str", "")
+
+        # Parse room data
+        with stage("llm.room_data"):
+            tvl_room = RoomData.from_dict(item, "tvl")
+            comp_room = RoomData.from_dict(item, "competitor")
+
+        try:
+            match_result = self._judge_pair(
+                client, types, tvl_room, comp_room, model, thinking_budget, new_item
+            )
+
+            new_item["solution_match_status"] = match_result.decision
+            new_item["size_correct"] = match_result.size_correct
+            new_item["confidence_score"] = match_result.confidence_score
+            new_item["reasoning"] = match_result.reasoning
+
+            print(
+                f"\n[{uuid_str}] "
+                f"TVL:({tvl_room.name},{tvl_room.size},{tvl_room.bed_type},{tvl_room.occupancy}) "
+                f"VS COMP:({comp_room.name},{comp_room.size},{comp_room.bed_type},{comp_room.occupancy}) "
+                f"=> {match_result.decision} (conf:{match_result.confidence_score:.2f}, size_ok:{match_result.size_correct})"
+            )
+            print(f"Reasoning: {match_result.reasoning}")
+
+        except Exception as e:
+            print(f"❌ Error calling LLM for {uuid_str}: {e}", file=sys.stderr)
+            new_item["solution_match_status"] = "mismatched"
+            new_item["size_correct"] = MatchResult._calculate_size_correct(
+                tvl_room.size, comp_room.size
+            )
+            new_item["confidence_score"] = 0.0
+            new_item["reasoning"] = f"Error: {str(e)}"
+            new_item["llm_error"] = str(e)
+
+        return new_item
+
+    def _get_pair_judge(self) -> Optional[Callable[..., MatchResult]]:
+        """Return an LLM judge for single room pairs, None without a client
+
+        The judge takes (tvl_room, comp_room) and an optional record dict
+        that receives the usage fields of the call.
+        """
+        client = self._get_client()
+        if not client:
+            return None
+
+        from google.genai import types
+
+        def judge(
+            tvl_room: RoomData,
+            comp_room: RoomData,
+            record: Optional[Dict[str, Any]] = None,
+        ) -> MatchResult:
+            return self._judge_pair(
+                client,
+                types,
+                tvl_room,
+                comp_room,
+                self.model,
+                self.thinking_budget,
+                record if record is not None else {},
+            )
+
+        return judge
+
+    def match_hotel(
+        self,
+        tvl_rooms: List[RoomData],
+        comp_rooms: List[RoomData],
+        judge: Optional[Callable[[RoomData, RoomData], MatchResult]] = None,
+        blocker: Optional[CandidateBlocker] = None,
+    ) -> Dict[str, Any]:
+        """Match every TVL room of a hotel against its competitor rooms
+
+        Identical competitor rooms (rate plans of one room) are judged once,
+        and the N×M pairs are pruned by a CandidateBlocker before the judge
+        (the LLM by default) sees them. Each TVL room gets the matched
+        competitor room with the highest confidence, ties broken by the
+        closest size, or None.
+        """
+        blocker = blocker or CandidateBlocker()
+        judge = judge or self._get_pair_judge()
+        if judge is None:
+            print("⚠️ No judge available, skipping hotel matching", file=sys.stderr)
+
+        unique_comps: List[RoomData] = []
+        seen: Dict[Tuple[Any, ...], int] = {}
+        for room in comp_rooms:
+            signature = (room.name, room.bed_type, room.occupancy, room.size)
+            if signature not in seen:
+                seen[signature] = len(unique_comps)
+                unique_comps.append(room)
+
+        candidates = blocker.candidate_pairs(tvl_rooms, unique_comps)
+        to_judge = candidates if judge is not None else []
+
+        best: Dict[int, Tuple[Tuple[float, float], int, MatchResult]] = {}
+        pairs_judged = errors = 0
+        for i, j in to_judge:
+            tvl_room, comp_room = tvl_rooms[i], unique_comps[j]
+            try:
+                match_result = judge(tvl_room, comp_room)
+            except Exception as e:
+                print(
+                    f"❌ Error judging {tvl_room.name} VS {comp_room.name}: {e}",
+                    file=sys.stderr,
+                )
+                errors += 1
+                continue
+            pairs_judged += 1
+            if match_result.decision != "matched":
+                continue
+
+            spd = size_spd(tvl_room.size, comp_room.size)
+            rank = (match_result.confidence_score, -spd if spd is not None else -1.0)
+            if i not in best or rank > best[i][0]:
+                best[i] = (rank, j, match_result)
+
+        matches = []
+        for i, tvl_room in enumerate(tvl_rooms):
+            _, j, match_result = best.get(i, (None, None, None))
+            matches.append(
+                {
+                    "tvl_room": tvl_room,
+                    "competitor_room": unique_comps[j] if j is not None else None,
+                    "match_result": match_result,
+                }
+            )
+
+        total_pairs = len(tvl_rooms) * len(comp_rooms)
+        unique_pairs = len(tvl_rooms) * len(unique_comps)
+        return {
+            "matches": matches,
+            "stats": {
+                "tvl_rooms": len(tvl_rooms),
+                "competitor_rooms": len(comp_rooms),
+                "unique_competitor_rooms": len(unique_comps),
+                "total_pairs": total_pairs,
+                "unique_pairs": unique_pairs,
+                "candidate_pairs": len(candidates),
+                "pairs_judged": pairs_judged,
+                "errors": errors,
+                # Share removed by merging rate plans, then by blocking
+                "dedup_ratio": 1 - unique_pairs / total_pairs if total_pairs else 0.0,
+                "pruning_ratio": 1 - len(candidates) / unique_pairs
+                if unique_pairs
+                else 0.0,
+            },
+        }
+
+    def fit_local_scorer(self, data: List[Dict[str, Any]]) -> bool:
+        """Fit the local scorer's n-gram IDF on all room names of `data`
+
+        Fit once on a fixed corpus (the full dataset) so local_solution
+        scores every batch the same way. False if numpy is not installed.
+        """
+        try:
+            from local_scorer import LocalSimilarityScorer
+        except ImportError:
+            return False
+
+        names = [
+            RoomData.from_dict(item, source).name
+            for item in data
+            for source in ("tvl", "competitor")
+        ]
+        self.local_scorer = LocalSimilarityScorer().fit(names)
+        return True
+
+    def local_solution(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Local vectorized similarity solution"""
+        if self.local_scorer is None:
+            if not self.fit_local_scorer(data):
+                print(
+                    "⚠️ numpy not installed, fallback to original solution",
+                    file=sys.stderr,
+                )
+                return self.original_solution(data)
+            print(
+                f"⚠️ Local scorer fitted on the first batch ({len(data)} items); "
+                "call fit_local_scorer() with the full dataset for stable scores",
+                file=sys.stderr,
+            )
+
+        tvl_rooms = [RoomData.from_dict(item, "tvl") for item in data]
+        comp_rooms = [RoomData.from_dict(item, "competitor") for item in data]
+        decisions = self.local_scorer.decisions(tvl_rooms, comp_rooms)
+
+        results = []
+        for item, tvl_room, comp_room, (decision, confidence) in zip(
+            data, tvl_rooms, comp_rooms, decisions
+        ):
+            new_item = item.copy()
+            new_item["solution_match_status"] = decision
+            new_item["size_correct"] = MatchResult._calculate_size_correct(
+                tvl_room.size, comp_room.size
+            )
+            new_item["confidence_score"] = confidence
+            new_item["reasoning"] = "Local n-gram TF-IDF similarity score"
+            results.append(new_item)
+        return results
+
     def llm_solution(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """LLM-based matching solution"""
+        return list(self.iter_llm_solution(data))
+
+    def iter_llm_solution(
+        self, data: Iterable[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """LLM-based matching solution, yielding each result as it is judged
+
+        Items are only sent to the LLM as the generator is consumed, so
+        closing it early stops the run.
+        """
         print(
             "--- Running LLM Solution (Enhanced with confidence scoring) ---",
             file=sys.stderr,
@@ -145,56 +907,81 @@ Competitor Room:
 
         client = self._get_client()
         if not client:
-            return self.original_solution(data)
-
-        results = []
-        for item in data:
-            new_item = item.copy()
-            uuid_str = item.get("uuid_str", "")
-
-            # Parse room data
-            tvl_room = RoomData.from_dict(item, "tvl")
-            comp_room = RoomData.from_dict(item, "competitor")
+            yield from self.original_solution(list(data))
+            return
 
-            # Create and send prompt
-            prompt = self._create_prompt(tvl_room, comp_room)
+        # Imported here so rule-only runs never pay for the genai/pydantic chain
+        from google.genai import types
 
-            try:
-                response = client.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        thinking_config=types.ThinkingConfig(thinking_budget=0)
-                    ),
+        try:
+            for item in data:
+                yield self._judge_item(
+                    client, types, item, self.model, self.thinking_budget
                 )
+        finally:
+            # Losing hedged primaries finish before anyone reports latencies
+            self.join_primaries()
+
+    def cascade_solution(
+        self,
+        data: List[Dict[str, Any]],
+        confidence_threshold: float = 0.8,
+        first_stage_model: str = "gemini-2.5-flash-lite",
+        escalation_thinking_budget: int = 1024,
+    ) -> List[Dict[str, Any]]:
+        """Confidence-based model cascade
+
+        Every pair is judged by the cheaper first-stage model (or by the
+        local scorer when first_stage_model is LOCAL_MODEL); pairs whose
+        confidence falls below the threshold are re-judged by `self.model`
+        with a thinking budget. Latency, tokens and cost of both stages are
+        summed per item.
+        """
+        print(
+            f"--- Running Cascade Solution ({first_stage_model} → {self.model}, "
+            f"threshold {confidence_threshold}) ---",
+            file=sys.stderr,
+        )
 
-                # Parse XML response instead of JSON
-                match_result = MatchResult.from_llm_xml_response(
-                    response.text, tvl_room, comp_room
-                )
+        client = self._get_client()
+        if not client:
+            return self.original_solution(data)
 
-                new_item["solution_match_status"] = match_result.decision
-                new_item["size_correct"] = match_result.size_correct
-                new_item["confidence_score"] = match_result.confidence_score
-                new_item["reasoning"] = match_result.reasoning
+        from google.genai import types
 
-                print(
-                    f"\n[{uuid_str}] "
-                    f"TVL:({tvl_room.name},{tvl_room.size},{tvl_room.bed_type},{tvl_room.occupancy}) "
-                    f"VS COMP:({comp_room.name},{comp_room.size},{comp_room.bed_type},{comp_room.occupancy}) "
-                    f"=> {match_result.decision} (conf:{match_result.confidence_score:.2f}, size_ok:{match_result.size_correct})"
-                )
-                print(f"Reasoning: {match_result.reasoning}")
+        if first_stage_model == LOCAL_MODEL:
+            first_stage = self.local_solution(data)
+        else:
+            first_stage = (
+                self._judge_item(client, types, item, first_stage_model, 0)
+                for item in data
+            )
 
-            except Exception as e:
-                print(f"❌ Error calling LLM for {uuid_str}: {e}", file=sys.stderr)
-                new_item["solution_match_status"] = "mismatched"
-                new_item["size_correct"] = MatchResult._calculate_size_correct(
-                    tvl_room.size, comp_room.size
-                )
-                new_item["confidence_score"] = 0.0
-                new_item["reasoning"] = f"Error: {str(e)}"
+        results = []
+        escalations = []
+        for item, first in zip(data, first_stage):
+            first["escalated"] = False
+            first["first_stage_confidence"] = first["confidence_score"]
 
-            results.append(new_item)
+            if first["confidence_score"] >= confidence_threshold:
+                results.append(first)
+                continue
+
+            escalated = self._judge_item(
+                client, types, item, self.model, escalation_thinking_budget
+            )
+            escalated["escalated"] = True
+            escalated["first_stage_confidence"] = first["confidence_score"]
+            escalations.append((first, escalated))
+            results.append(escalated)
+
+        # Both stages' unhedged latencies must be final before they are summed
+        self.join_primaries()
+        for first, escalated in escalations:
+            for key in USAGE_TOTAL_KEYS:
+                if key in first or key in escalated:
+                    escalated[key] = escalated.get(key, 0) + first.get(key, 0)
+            if "hedged" in first or "hedged" in escalated:
+                escalated["hedged"] = first.get("hedged") or escalated.get("hedged")
 
         return results
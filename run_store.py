@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, List
+
+# Fields that identify an item in one run only and must not affect its hash
+VOLATILE_FIELDS = ("uuid_str",)
+
+
+def content_hash(item: Dict[str, Any]) -> str:
+    """Stable hash of an input item's content"""
+    content = {k: v for k, v in item.items() if k not in VOLATILE_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class RunStore:
+    """Results of previous runs, per solution, keyed by item content hash
+
+    Stored as JSON: {solution: {"fingerprint": str, "results": {hash: fields}}}
+    where `fields` are the keys the solution added to the item.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.solutions: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.solutions = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Error loading run store {path}: {e}", file=sys.stderr)
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.solutions, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class IncrementalRunner:
+    """Runs solutions only on items that are new or affected since last run
+
+    An item is reused when its content hash is in the store and the
+    solution's fingerprint (prompt, model, parameters) is unchanged; a new
+    fingerprint invalidates every stored result of that solution.
+    """
+
+    def __init__(self, store: RunStore):
+        self.store = store
+
+    def run(
+        self,
+        solution_name: str,
+        solution: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+        data: List[Dict[str, Any]],
+        solution_fingerprint: str,
+    ) -> List[Dict[str, Any]]:
+        """Return results aligned with data, merging stored and new ones"""
+        entry = self.store.solutions.get(solution_name)
+        if entry is None or entry.get("fingerprint") != solution_fingerprint:
+            entry = {"fingerprint": solution_fingerprint, "results": {}}
+            self.store.solutions[solution_name] = entry
+        stored = entry["results"]
+
+        hashes = [content_hash(item) for item in data]
+        # Items with equal content are computed once, in first-seen order
+        pending: Dict[str, Dict[str, Any]] = {}
+        for item, h in zip(data, hashes):
+            if h not in stored and h not in pending:
+                pending[h] = item
+        computed = dict(zip(pending, solution(list(pending.values())))) if pending else {}
+
+        results = []
+        for item, h in zip(data, hashes):
+            result = computed.get(h)
+            if result is None:
+                results.append({**item, **stored[h], "reused": True})
+                continue
+            fields = {k: v for k, v in result.items() if k not in pending[h]}
+            if item is pending[h]:
+                results.append(result)
+            else:
+                # A duplicate of an item computed in this run
+                results.append({**item, **fields, "reused": True})
+            # Failed LLM calls are retried on the next run
+            if "llm_error" not in result:
+                stored[h] = fields
+
+        self.store.save()
+        print(
+            f"Incremental [{solution_name}]: {len(data) - len(pending)} reused, "
+            f"{len(pending)} recomputed (fingerprint {solution_fingerprint})"
+        )
+        return results
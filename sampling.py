@@ -0,0 +1,162 @@
+import math
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Fields already in the benchmark data used to define strata
+STRATA_FIELDS = (
+    "status_tag",
+    "tvl.others.room_size_bin",
+    "competitor.others.competitor_id",
+)
+
+
+def get_field(item: Dict[str, Any], path: str) -> str:
+    """Read a dotted field path from an item, "" if any level is missing"""
+    value: Any = item
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return ""
+        value = value.get(key)
+    return "" if value is None else str(value)
+
+
+def wilson_interval(
+    successes: int, total: int, z: float = 1.96
+) -> Tuple[float, float]:
+    """Wilson score interval of a proportion (0, 1) when there is no data"""
+    if total == 0:
+        return 0.0, 1.0
+    p = successes / total
+    denominator = 1 + z**2 / total
+    center = (p + z**2 / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z**2 / (4 * total**2)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+class StratifiedSampler:
+    """Representative samples of the dataset, stratified by STRATA_FIELDS"""
+
+    def __init__(self, fields: Iterable[str] = STRATA_FIELDS, seed: int = 0):
+        self.fields = tuple(fields)
+        self.seed = seed
+
+    def strata(
+        self, data: List[Dict[str, Any]]
+    ) -> Dict[Tuple[str, ...], List[Dict[str, Any]]]:
+        """Group items by their stratum key, each group shuffled"""
+        rng = random.Random(self.seed)
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for item in data:
+            key = tuple(get_field(item, field) for field in self.fields)
+            groups.setdefault(key, []).append(item)
+        for key in sorted(groups):
+            rng.shuffle(groups[key])
+        return groups
+
+    def sample(self, data: List[Dict[str, Any]], n: int) -> List[Dict[str, Any]]:
+        """Proportionally allocated sample of n items (largest remainder)"""
+        if n >= len(data):
+            return list(data)
+        groups = self.strata(data)
+        quotas = {key: len(items) * n / len(data) for key, items in groups.items()}
+        allocation = {key: int(quota) for key, quota in quotas.items()}
+        by_remainder = sorted(
+            groups, key=lambda key: (quotas[key] - allocation[key], key), reverse=True
+        )
+        for key in by_remainder[: n - sum(allocation.values())]:
+            allocation[key] += 1
+        return [item for key in sorted(groups) for item in groups[key][: allocation[key]]]
+
+    def stream(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """All items ordered so that every prefix is close to proportional
+
+        Item j of a stratum of size m is placed at (j + offset) / m with a
+        random per-stratum offset (systematic sampling), so taking the first
+        k items approximates a stratified sample of size k.
+        """
+        rng = random.Random(self.seed + 1)
+        keyed = []
+        for key, items in sorted(self.strata(data).items()):
+            offset = rng.random()
+            keyed.extend(((j + offset) / len(items), item) for j, item in enumerate(items))
+        keyed.sort(key=lambda entry: entry[0])
+        return [item for _, item in keyed]
+
+
+class SequentialEvaluator:
+    """Feeds pairs to a solution until precision/recall CIs are narrow enough
+
+    Items are taken in batches from a (stratified) stream. After each batch
+    the Wilson intervals of precision (TP / (TP+FP)) and recall
+    (TP / (TP+FN)) are recomputed; evaluation stops once both half-widths
+    are at most `target_half_width` and `min_items` were seen, or when the
+    stream or `max_items` is exhausted.
+    """
+
+    def __init__(
+        self,
+        evaluator,
+        target_half_width: float = 0.05,
+        batch_size: int = 25,
+        min_items: int = 50,
+        max_items: Optional[int] = None,
+        z: float = 1.96,
+    ):
+        self.evaluator = evaluator
+        self.target_half_width = target_half_width
+        self.batch_size = batch_size
+        self.min_items = min_items
+        self.max_items = max_items
+        self.z = z
+
+    def intervals(self, metrics: Dict[str, Any]) -> Dict[str, Tuple[float, float]]:
+        tp, fp, fn = metrics["tp"], metrics["fp"], metrics["fn"]
+        return {
+            "precision": wilson_interval(tp, tp + fp, self.z),
+            "recall": wilson_interval(tp, tp + fn, self.z),
+        }
+
+    def run(
+        self,
+        solution: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+        stream: List[Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return (consumed input items, solution results)"""
+        limit = len(stream) if self.max_items is None else min(self.max_items, len(stream))
+        consumed: List[Dict[str, Any]] = []
+        results: List[Dict[str, Any]] = []
+        start_time = time.perf_counter()
+
+        while len(consumed) < limit:
+            batch = stream[len(consumed) : min(len(consumed) + self.batch_size, limit)]
+            consumed.extend(batch)
+            results.extend(solution(batch))
+
+            metrics = self.evaluator._calculate_metrics(results)
+            intervals = self.intervals(metrics)
+            half_widths = {
+                name: (high - low) / 2 for name, (low, high) in intervals.items()
+            }
+            print(
+                f"[sequential] n={len(results)} "
+                f"P={metrics['precision']:.3f} ±{half_widths['precision']:.3f} "
+                f"R={metrics['recall']:.3f} ±{half_widths['recall']:.3f} "
+                f"({time.perf_counter() - start_time:.1f}s)",
+                file=sys.stderr,
+            )
+            if len(results) >= self.min_items and all(
+                width <= self.target_half_width for width in half_widths.values()
+            ):
+                break
+
+        print(
+            f"\nSequential evaluation stopped after {len(results)} of {limit} items "
+            f"({limit - len(results)} solution calls saved)"
+        )
+        for name, (low, high) in self.intervals(
+            self.evaluator._calculate_metrics(results)
+        ).items():
+            print(f"  {name.capitalize()} CI (z={self.z:.2f}): [{low:.4f}, {high:.4f}]")
+        return consumed, results
@@ -0,0 +1,111 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Modules whose import cost is tracked, in dependency order
+MODULES = ["room_data", "room_matcher", "benchmark"]
+
+# Heavy dependencies that must only be imported when an LLM backend is used
+FORBIDDEN_AT_STARTUP = ["google.genai", "pydantic"]
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Parse `python -X importtime` output into (module, self_us, cumulative_us)"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            entries.append((name.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return entries
+
+
+def measure_import(module: str) -> List[Tuple[str, int, int]]:
+    """Import a module in a fresh interpreter and return its importtime entries"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+    return parse_importtime(proc.stderr)
+
+
+def run_benchmark(
+    modules: List[str], repeat: int, top: int
+) -> Tuple[Dict[str, float], Dict[str, List[str]]]:
+    """Measure median cumulative import time (ms) per module
+
+    Also returns, per module, which forbidden dependencies it pulled in.
+    """
+    timings: Dict[str, float] = {}
+    violations: Dict[str, List[str]] = {}
+
+    for module in modules:
+        samples = []
+        entries: List[Tuple[str, int, int]] = []
+        for _ in range(repeat):
+            entries = measure_import(module)
+            cumulative = next((c for n, _, c in entries if n == module), 0)
+            samples.append(cumulative / 1000)
+        timings[module] = statistics.median(samples)
+
+        imported = {name for name, _, _ in entries}
+        violations[module] = [
+            dep
+            for dep in FORBIDDEN_AT_STARTUP
+            if any(n == dep or n.startswith(dep + ".") for n in imported)
+        ]
+
+        print(f"\n=== import {module}: {timings[module]:.1f} ms (median of {repeat}) ===")
+        for name, self_us, cumulative_us in sorted(
+            entries, key=lambda e: e[1], reverse=True
+        )[:top]:
+            print(f"  {self_us / 1000:8.2f} ms self | {cumulative_us / 1000:8.2f} ms cum | {name}")
+
+    return timings, violations
+
+
+def main():
+    """Report import cost and fail if startup regresses"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--max-ms",
+        type=float,
+        default=150.0,
+        help="Fail if any module's cumulative import time exceeds this budget",
+    )
+    args = parser.parse_args()
+
+    timings, violations = run_benchmark(MODULES, args.repeat, args.top)
+
+    failed = False
+    print("\n=== Startup Import Summary ===")
+    for module in MODULES:
+        status = "OK"
+        if timings[module] > args.max_ms:
+            status = f"OVER BUDGET (>{args.max_ms:.0f} ms)"
+            failed = True
+        if violations[module]:
+            status = f"IMPORTS {', '.join(violations[module])}"
+            failed = True
+        print(f"{module:<15} {timings[module]:8.1f} ms  {status}")
+    print("==============================")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
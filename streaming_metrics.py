@@ -0,0 +1,213 @@
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Substrings of LLM errors that mean the request was throttled
+THROTTLING_MARKERS = ("429", "RESOURCE_EXHAUSTED", "rate limit", "quota")
+
+
+def is_throttling_error(message: str) -> bool:
+    """Whether an LLM error message reports throttling"""
+    lowered = message.lower()
+    return any(marker.lower() in lowered for marker in THROTTLING_MARKERS)
+
+
+class MetricsAccumulator:
+    """Evaluation metrics updated one result at a time
+
+    Holds the running confusion matrix, size error, confidence and error
+    counts, so metrics() is O(1) at any point of a run. Status normalization
+    and room sizes come from the Evaluator.
+    """
+
+    def __init__(self, evaluator):
+        self.evaluator = evaluator
+        self.count = 0
+        self.total_matched = 0
+        self.size_incorrect_matches = 0
+        self.total_size_error = 0.0
+        self.tp = self.fp = self.tn = self.fn = 0
+        self.confidence_sum = 0.0
+        self.low_confidence_count = 0
+        self.errors = 0
+        self.throttled = 0
+        self.start_time = time.perf_counter()
+
+    def add(self, item: Dict[str, Any]):
+        size_correct = item.get("size_correct", False)
+        solution_status = self.evaluator._normalize_status(
+            item.get("solution_match_status", "")
+        )
+        confidence_score = item.get("confidence_score", 1.0)
+
+        self.count += 1
+        self.confidence_sum += confidence_score
+        if confidence_score < 0.7:
+            self.low_confidence_count += 1
+        if "llm_error" in item:
+            self.errors += 1
+            if is_throttling_error(item["llm_error"]):
+                self.throttled += 1
+
+        if solution_status == "matched":
+            self.total_matched += 1
+            if size_correct:
+                self.tp += 1
+            else:
+                self.fp += 1
+                self.size_incorrect_matches += 1
+                # Calculate size error if available
+                tvl_size = self.evaluator._get_room_size(item, "tvl")
+                comp_size = self.evaluator._get_room_size(item, "competitor")
+                if tvl_size and comp_size:
+                    self.total_size_error += abs(tvl_size - comp_size)
+        else:
+            if size_correct:
+                self.fn += 1
+            else:
+                self.tn += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Metrics of the results added so far (Evaluator._calculate_metrics keys)"""
+        tp, fp, fn = self.tp, self.fp, self.fn
+        precision = tp / (tp + fp) if (tp + fp) > 0 else 0
+        recall = tp / (tp + fn) if (tp + fn) > 0 else 0
+        f1_score = (
+            2 * (precision * recall) / (precision + recall)
+            if (precision + recall) > 0
+            else 0
+        )
+
+        return {
+            "total_matched": self.total_matched,
+            "size_incorrect_matches": self.size_incorrect_matches,
+            "avg_size_error": self.total_size_error / self.size_incorrect_matches
+            if self.size_incorrect_matches > 0
+            else 0,
+            "precision": precision,
+            "recall": recall,
+            "f1_score": f1_score,
+            "tp": tp,
+            "fp": fp,
+            "tn": self.tn,
+            "fn": fn,
+            "avg_confidence": self.confidence_sum / self.count if self.count else 0,
+            "low_confidence_count": self.low_confidence_count,
+        }
+
+    def error_rate(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    def throttle_rate(self) -> float:
+        return self.throttled / self.count if self.count else 0.0
+
+    def throughput(self) -> float:
+        """Results per second since the accumulator was created"""
+        elapsed = time.perf_counter() - self.start_time
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+
+class LiveEvaluator:
+    """Consumes a stream of results with live progress and early abort
+
+    Every result updates a MetricsAccumulator. A progress line is printed
+    every `progress_every` results or `progress_interval_s` seconds. Once
+    `min_items` results were seen, the run is aborted (the stream is closed,
+    so no further LLM calls are made) when the error rate exceeds
+    `max_error_rate` or the throttling rate exceeds `max_throttle_rate`.
+    """
+
+    def __init__(
+        self,
+        evaluator,
+        progress_every: int = 25,
+        progress_interval_s: float = 10.0,
+        max_error_rate: Optional[float] = None,
+        max_throttle_rate: Optional[float] = None,
+        min_items: int = 20,
+    ):
+        self.evaluator = evaluator
+        self.progress_every = progress_every
+        self.progress_interval_s = progress_interval_s
+        self.max_error_rate = max_error_rate
+        self.max_throttle_rate = max_throttle_rate
+        self.min_items = min_items
+
+    def run(
+        self, stream: Iterable[Dict[str, Any]], total: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return (results consumed, abort reason or None)"""
+        accumulator = MetricsAccumulator(self.evaluator)
+        results: List[Dict[str, Any]] = []
+        abort_reason = None
+        last_report = time.perf_counter()
+        reported_count = 0
+
+        iterator = iter(stream)
+        for item in iterator:
+            results.append(item)
+            accumulator.add(item)
+
+            now = time.perf_counter()
+            if (
+                accumulator.count % self.progress_every == 0
+                or now - last_report >= self.progress_interval_s
+            ):
+                self._print_progress(accumulator, total)
+                last_report, reported_count = now, accumulator.count
+
+            abort_reason = self._abort_reason(accumulator)
+            if abort_reason:
+                break
+
+        if hasattr(iterator, "close"):
+            iterator.close()
+        if accumulator.count != reported_count:
+            self._print_progress(accumulator, total)
+        if abort_reason:
+            print(
+                f"❌ Aborted after {accumulator.count} results: {abort_reason}",
+                file=sys.stderr,
+            )
+        return results, abort_reason
+
+    def _abort_reason(self, accumulator: MetricsAccumulator) -> Optional[str]:
+        if accumulator.count < self.min_items:
+            return None
+        if (
+            self.max_error_rate is not None
+            and accumulator.error_rate() > self.max_error_rate
+        ):
+            return (
+                f"error rate {accumulator.error_rate() * 100:.1f}% "
+                f"> {self.max_error_rate * 100:.1f}%"
+            )
+        if (
+            self.max_throttle_rate is not None
+            and accumulator.throttle_rate() > self.max_throttle_rate
+        ):
+            return (
+                f"throttling rate {accumulator.throttle_rate() * 100:.1f}% "
+                f"> {self.max_throttle_rate * 100:.1f}%"
+            )
+        return None
+
+    def _print_progress(
+        self, accumulator: MetricsAccumulator, total: Optional[int]
+    ):
+        metrics = accumulator.metrics()
+        throughput = accumulator.throughput()
+        progress = f"{accumulator.count}/{total}" if total else str(accumulator.count)
+        eta = ""
+        if total and throughput > 0:
+            eta = f" ETA {(total - accumulator.count) / throughput:.0f}s"
+        print(
+            f"[live] n={progress} "
+            f"TP/FP/TN/FN={metrics['tp']}/{metrics['fp']}/{metrics['tn']}/{metrics['fn']} "
+            f"P={metrics['precision']:.3f} R={metrics['recall']:.3f} "
+            f"F1={metrics['f1_score']:.3f} conf={metrics['avg_confidence']:.2f} "
+            f"errors={accumulator.errors} ({accumulator.error_rate() * 100:.1f}%) "
+            f"throttled={accumulator.throttled} "
+            f"{throughput:.1f} pairs/s{eta}",
+            file=sys.stderr,
+        )
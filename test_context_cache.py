@@ -0,0 +1,44 @@
+import time
+from types import SimpleNamespace
+
+from room_matcher import ContextCacheRegistry
+
+
+class CountingCaches:
+    def __init__(self):
+        self.created = 0
+
+    def create(self, model, config=None):
+        self.created += 1
+        return SimpleNamespace(name=f"cachedContents/{model}-{self.created}")
+
+
+FAKE_TYPES = SimpleNamespace(CreateCachedContentConfig=lambda **kwargs: kwargs)
+
+
+def test_cache_is_recreated_before_its_ttl_runs_out():
+    client = SimpleNamespace(caches=CountingCaches())
+    registry = ContextCacheRegistry(refresh_margin_s=0.1)
+
+    first = registry.get(client, FAKE_TYPES, "flash", ttl_seconds=0.3)
+    assert registry.get(client, FAKE_TYPES, "flash", ttl_seconds=0.3) == first
+    assert client.caches.created == 1
+
+    time.sleep(0.25)
+    refreshed = registry.get(client, FAKE_TYPES, "flash", ttl_seconds=0.3)
+    assert refreshed != first
+    assert client.caches.created == 2
+
+
+def test_failed_creation_is_not_retried():
+    attempts = []
+
+    def fail(model, config=None):
+        attempts.append(model)
+        raise RuntimeError("permission denied")
+
+    client = SimpleNamespace(caches=SimpleNamespace(create=fail))
+    registry = ContextCacheRegistry()
+    assert registry.get(client, FAKE_TYPES, "flash", ttl_seconds=3600) is None
+    assert registry.get(client, FAKE_TYPES, "flash", ttl_seconds=3600) is None
+    assert attempts == ["flash"]
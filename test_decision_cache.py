@@ -0,0 +1,45 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mock_llm import MockGenAIClient
+from room_data import RoomData
+from room_matcher import DecisionCache, RoomMatcher
+
+
+def make_item(name, uuid_str):
+    room = {"hard_metrics": {"room_name": name, "room_size": "30"}}
+    return {"uuid_str": uuid_str, "tvl": room, "competitor": room}
+
+
+def test_concurrent_duplicate_pairs_are_judged_once():
+    client = MockGenAIClient(latency_ms=50, jitter=0, seed=0)
+    matcher = RoomMatcher(decision_cache=DecisionCache(), client=client)
+    judge = matcher._get_pair_judge()
+    item = make_item("Deluxe King", "a")
+    tvl_room = RoomData.from_dict(item, "tvl")
+    comp_room = RoomData.from_dict(item, "competitor")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        decisions = list(pool.map(lambda _: judge(tvl_room, comp_room), range(8)))
+
+    assert client.models.calls == 1
+    assert len({result.decision for result in decisions}) == 1
+    assert (matcher.decision_cache.hits, matcher.decision_cache.misses) == (7, 1)
+
+
+def test_released_key_is_judged_by_a_waiting_caller():
+    cache = DecisionCache()
+    key = ("model", "full", 0, "Deluxe King")
+    assert cache.get(key) is None
+
+    waiter_result = []
+    waiter = threading.Thread(target=lambda: waiter_result.append(cache.get(key)))
+    waiter.start()
+    time.sleep(0.05)
+    assert waiter.is_alive()
+
+    cache.release(key)
+    waiter.join(timeout=1)
+    assert waiter_result == [None]
+    assert cache.misses == 2
@@ -0,0 +1,40 @@
+import threading
+import time
+
+from mock_llm import MockGenAIClient
+from room_matcher import HedgingPolicy, RoomMatcher
+
+
+def make_item(name, uuid_str):
+    room = {"hard_metrics": {"room_name": name, "room_size": "30"}}
+    return {"uuid_str": uuid_str, "tvl": room, "competitor": room}
+
+
+def test_unhedged_latency_waits_for_losing_primary():
+    client = MockGenAIClient(latency_ms=0, jitter=0, seed=0)
+    answer = client.models.generate_content
+    calls = []
+    lock = threading.Lock()
+
+    def generate_content(**kwargs):
+        with lock:
+            calls.append(len(calls))
+            slow = len(calls) == 2  # the second pair's primary call
+        time.sleep(0.3 if slow else 0.005)
+        return answer(**kwargs)
+
+    client.models.generate_content = generate_content
+    matcher = RoomMatcher(
+        client=client,
+        hedging=HedgingPolicy(max_hedge_rate=1.0, percentile=50, min_samples=1),
+    )
+
+    results = matcher.llm_solution(
+        [make_item("Deluxe King", "a"), make_item("Superior Twin", "b")]
+    )
+
+    assert results[1]["hedged"]
+    assert results[1]["latency_s"] < 0.2
+    assert results[1]["unhedged_latency_s"] >= 0.3
+    assert not results[0]["hedged"]
+    assert results[0]["unhedged_latency_s"] == results[0]["latency_s"]
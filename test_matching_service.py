@@ -0,0 +1,63 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from matching_service import build_matcher, create_server
+
+
+def make_item(name, size):
+    return {
+        "uuid_str": name,
+        "tvl": {"hard_metrics": {"room_name": name, "room_size": size}},
+        "competitor": {"hard_metrics": {"room_name": name, "room_size": size}},
+    }
+
+
+@pytest.fixture
+def server():
+    server, batcher = create_server(
+        build_matcher(mock=True, mock_latency_ms=0), port=0, window_ms=1, timeout_s=5
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(server, payload):
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{server.server_port}/match",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_non_object_items_are_rejected(server):
+    status, body = post(server, {"items": ["bad"]})
+    assert status == 400
+    assert "items" in body["error"]
+
+    status, body = post(server, {"items": make_item("Deluxe King", "30")})
+    assert status == 400
+
+
+def test_malformed_item_does_not_stop_the_batcher(server):
+    status, body = post(
+        server, {"items": [{"tvl": "bad"}, make_item("Deluxe King", "30")]}
+    )
+    assert status == 200
+    assert "error" in body["results"][0]
+    assert "decision" in body["results"][1]
+
+    status, body = post(server, {"items": [make_item("Superior Twin", "25")]})
+    assert status == 200
+    assert "decision" in body["results"][0]
@@ -0,0 +1,56 @@
+from run_store import IncrementalRunner, RunStore
+
+
+def make_item(name, uuid_str):
+    return {"uuid_str": uuid_str, "tvl": {"hard_metrics": {"room_name": name}}}
+
+
+class CountingSolution:
+    """Tags each item with its room name and records what it was called with"""
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.calls = []
+
+    def __call__(self, data):
+        self.calls.append([item["uuid_str"] for item in data])
+        return [
+            {**item, "label": f"{self.tag}:{item['tvl']['hard_metrics']['room_name']}"}
+            for item in data
+        ]
+
+
+def test_duplicate_new_items_keep_results_aligned(tmp_path):
+    x = make_item("Deluxe King", "x")
+    x_copy = make_item("Deluxe King", "x-copy")
+    y = make_item("Superior Twin", "y")
+    solution = CountingSolution("v1")
+    runner = IncrementalRunner(RunStore(str(tmp_path / "runs.json")))
+
+    results = runner.run("s", solution, [x, x_copy, y], "fp")
+
+    assert solution.calls == [["x", "y"]]
+    assert [r["uuid_str"] for r in results] == ["x", "x-copy", "y"]
+    assert [r["label"] for r in results] == [
+        "v1:Deluxe King",
+        "v1:Deluxe King",
+        "v1:Superior Twin",
+    ]
+    assert [r.get("reused", False) for r in results] == [False, True, False]
+
+
+def test_stored_results_are_reused_until_fingerprint_changes(tmp_path):
+    path = str(tmp_path / "runs.json")
+    x, y = make_item("Deluxe King", "x"), make_item("Superior Twin", "y")
+    IncrementalRunner(RunStore(path)).run("s", CountingSolution("v1"), [x], "fp1")
+
+    same = CountingSolution("v1")
+    results = IncrementalRunner(RunStore(path)).run("s", same, [x, y], "fp1")
+    assert same.calls == [["y"]]
+    assert [r.get("reused", False) for r in results] == [True, False]
+
+    changed = CountingSolution("v2")
+    results = IncrementalRunner(RunStore(path)).run("s", changed, [x, y], "fp2")
+    assert changed.calls == [["x", "y"]]
+    assert [r["label"] for r in results] == ["v2:Deluxe King", "v2:Superior Twin"]
+    assert not any(r.get("reused") for r in results)
@@ -0,0 +1,177 @@
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from room_matcher import (
+    DEFAULT_MODEL,
+    ContextCacheRegistry,
+    DecisionCache,
+    RoomMatcher,
+)
+
+# Solutions a variant can run; "llm" goes through the shared scheduler
+VARIANT_SOLUTIONS = ("llm", "original", "local")
+
+
+@dataclass
+class SolutionVariant:
+    """One solution configuration of a multi-variant comparison run
+
+    `max_in_flight` caps how many of this variant's LLM requests the shared
+    scheduler keeps open at once (its batch size on the shared pool).
+    """
+
+    name: str
+    solution: str = "llm"
+    model: str = DEFAULT_MODEL
+    prompt_mode: str = "full"
+    thinking_budget: int = 0
+    max_in_flight: int = 8
+
+    def __post_init__(self):
+        if self.solution not in VARIANT_SOLUTIONS:
+            raise ValueError(
+                f"Unknown solution {self.solution!r}, "
+                f"expected one of {VARIANT_SOLUTIONS}"
+            )
+
+
+class VariantRunner:
+    """Runs N solution variants concurrently over the same dataset
+
+    All LLM variants share one client, one DecisionCache, one
+    ContextCacheRegistry and one request scheduler: a pool of
+    `max_concurrency` workers fed round-robin from the variants' queues,
+    each variant limited to its `max_in_flight` open requests. A slow
+    variant therefore cannot starve the others, and the total request rate
+    stays bounded however many variants are declared. Variants with the
+    same configuration judge each pair once: the cache makes a concurrent
+    request for a pair being judged wait for that decision.
+    """
+
+    def __init__(
+        self,
+        variants: List[SolutionVariant],
+        max_concurrency: int = 16,
+        client=None,
+        decision_cache: Optional[DecisionCache] = None,
+        local_scorer=None,
+    ):
+        names = [variant.name for variant in variants]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Variant names must be unique: {names}")
+        self.variants = variants
+        self.max_concurrency = max_concurrency
+        self.decision_cache = (
+            decision_cache if decision_cache is not None else DecisionCache()
+        )
+        self.client = client
+        # Fitted once on a fixed corpus so local variants score like the rest
+        self.local_scorer = local_scorer
+
+    def _build_matchers(self) -> Dict[str, RoomMatcher]:
+        shared = RoomMatcher(decision_cache=self.decision_cache, client=self.client)
+        client = shared._get_client()
+        # Each model's rules cache is uploaded once for all variants
+        context_caches = ContextCacheRegistry()
+        matchers = {}
+        for variant in self.variants:
+            matcher = RoomMatcher(
+                model=variant.model,
+                thinking_budget=variant.thinking_budget,
+                prompt_mode=variant.prompt_mode,
+                decision_cache=self.decision_cache,
+                client=client,
+                local_scorer=self.local_scorer,
+                context_caches=context_caches,
+            )
+            matchers[variant.name] = matcher
+        return matchers
+
+    def run(self, data: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Return {variant name: results aligned with data}"""
+        matchers = self._build_matchers()
+        results: Dict[str, List[Optional[Dict[str, Any]]]] = {}
+        llm_variants = []
+        for variant in self.variants:
+            matcher = matchers[variant.name]
+            if variant.solution == "original":
+                results[variant.name] = matcher.original_solution(data)
+            elif variant.solution == "local":
+                results[variant.name] = matcher.local_solution(data)
+            elif not matcher._get_client():
+                results[variant.name] = matcher.original_solution(data)
+            else:
+                results[variant.name] = [None] * len(data)
+                llm_variants.append(variant)
+
+        if llm_variants:
+            self._schedule(llm_variants, matchers, data, results)
+        return results  # type: ignore[return-value]
+
+    def _schedule(
+        self,
+        variants: List[SolutionVariant],
+        matchers: Dict[str, RoomMatcher],
+        data: List[Dict[str, Any]],
+        results: Dict[str, List[Optional[Dict[str, Any]]]],
+    ):
+        """Judge every (variant, item) on the shared pool, round-robin"""
+        from google.genai import types
+
+        print(
+            f"--- Running {len(variants)} LLM variants concurrently "
+            f"({len(data)} pairs each, {self.max_concurrency} workers) ---",
+            file=sys.stderr,
+        )
+        next_index = {variant.name: 0 for variant in variants}
+        in_flight = {variant.name: 0 for variant in variants}
+        pending: Dict[Future, Tuple[str, int]] = {}
+        start_time = time.perf_counter()
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="variant"
+        ) as pool:
+            while True:
+                # Top up the pool one request per variant per round
+                submitted = True
+                while submitted and len(pending) < self.max_concurrency:
+                    submitted = False
+                    for variant in variants:
+                        name = variant.name
+                        if (
+                            next_index[name] >= len(data)
+                            or in_flight[name] >= variant.max_in_flight
+                            or len(pending) >= self.max_concurrency
+                        ):
+                            continue
+                        matcher = matchers[name]
+                        future = pool.submit(
+                            matcher._judge_item,
+                            matcher._get_client(),
+                            types,
+                            data[next_index[name]],
+                            variant.model,
+                            variant.thinking_budget,
+                        )
+                        pending[future] = (name, next_index[name])
+                        next_index[name] += 1
+                        in_flight[name] += 1
+                        submitted = True
+
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, index = pending.pop(future)
+                    in_flight[name] -= 1
+                    results[name][index] = future.result()
+
+        print(
+            f"Variants done in {time.perf_counter() - start_time:.1f}s "
+            f"(decision cache: {self.decision_cache.hits} hits, "
+            f"{self.decision_cache.misses} misses)",
+            file=sys.stderr,
+        )